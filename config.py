@@ -1,10 +1,11 @@
 """Configuration loading and validation for sourcify-sync."""
 
 import os
+import posixpath
 import tomllib
 from dataclasses import dataclass
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
 
 DEFAULT_CONFIG_PATH = Path("config.toml")
@@ -17,10 +18,14 @@ DEFAULTS = {
     "integrity_check": True,
     "integrity_retry_count": 3,
     "concurrent_validations": None,  # None = os.cpu_count() or 4
+    "validation_processes": False,
+    "deep_integrity": False,
+    "aria2c_rpc_url": None,  # None = spawn aria2c per run
+    "aria2c_rpc_secret": None,
 }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Config:
     manifest_url: str
     download_dir: Path
@@ -30,12 +35,26 @@ class Config:
     integrity_check: bool
     integrity_retry_count: int
     concurrent_validations: int
+    validation_processes: bool = False
+    deep_integrity: bool = False
+    aria2c_rpc_url: str | None = None
+    aria2c_rpc_secret: str | None = None
+
+    def __post_init__(self) -> None:
+        # Download URLs are built as base_url + relative_path
+        if not self.base_url.endswith("/"):
+            raise ValueError(f"base_url must end with '/': {self.base_url!r}")
 
     @property
     def session_file(self) -> Path:
         """Path to aria2c session file for resume support."""
         return self.download_dir / ".aria2c-session"
 
+    @property
+    def validation_cache_file(self) -> Path:
+        """Path to cache of files that already passed integrity checks."""
+        return self.download_dir / ".sync-cache.json"
+
     @classmethod
     def load(
         cls,
@@ -45,6 +64,9 @@ class Config:
         concurrency_override: int | None = None,
         integrity_retry_count_override: int | None = None,
         concurrent_validations_override: int | None = None,
+        validation_processes_override: bool | None = None,
+        deep_integrity_override: bool | None = None,
+        aria2c_rpc_url_override: str | None = None,
     ) -> "Config":
         """Load configuration from TOML file with defaults."""
         config_data = dict(DEFAULTS)
@@ -65,6 +87,12 @@ class Config:
             config_data["integrity_retry_count"] = integrity_retry_count_override
         if concurrent_validations_override is not None:
             config_data["concurrent_validations"] = concurrent_validations_override
+        if validation_processes_override is not None:
+            config_data["validation_processes"] = validation_processes_override
+        if deep_integrity_override is not None:
+            config_data["deep_integrity"] = deep_integrity_override
+        if aria2c_rpc_url_override:
+            config_data["aria2c_rpc_url"] = aria2c_rpc_url_override
 
         # Resolve concurrent_validations default
         concurrent_validations = config_data.get("concurrent_validations")
@@ -73,7 +101,8 @@ class Config:
 
         manifest_url = config_data["manifest_url"]
         parsed = urlparse(manifest_url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}{'/'.join(parsed.path.rsplit('/', 1)[:-1])}/"
+        base_dir = posixpath.dirname(parsed.path).rstrip("/")
+        base_url = f"{parsed.scheme}://{parsed.netloc}{base_dir}/"
 
         return cls(
             manifest_url=manifest_url,
@@ -84,4 +113,8 @@ class Config:
             integrity_check=bool(config_data.get("integrity_check", True)),
             integrity_retry_count=int(config_data.get("integrity_retry_count", 3)),
             concurrent_validations=int(concurrent_validations),
+            validation_processes=bool(config_data.get("validation_processes", False)),
+            deep_integrity=bool(config_data.get("deep_integrity", False)),
+            aria2c_rpc_url=config_data.get("aria2c_rpc_url") or None,
+            aria2c_rpc_secret=config_data.get("aria2c_rpc_secret") or None,
         )
@@ -1,17 +1,51 @@
 """aria2c-based downloader for sourcify-sync with robust resume support."""
 
+import gzip
+import json
+import mmap
+import multiprocessing
 import os
+import re
+import shlex
+import shutil
 import subprocess
 import tempfile
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from itertools import chain, repeat
 from pathlib import Path
 
+import httpx
+
 from config import Config
 from logging_setup import get_logger
 
+# URL lines in an aria2c session file (option lines are indented)
+_SESSION_URL_RE = re.compile(rb"^https?://\S+", re.MULTILINE)
+
+# Magic bytes at the start and end of every (unencrypted) parquet file
+PARQUET_MAGIC = b"PAR1"
+
+# Progress callbacks per pass when the interval is chosen automatically;
+# a 40-cell bar can't show more states than this anyway
+PROGRESS_UPDATES_PER_PASS = 200
+
+# Upper bound on files handed to a validation worker per task
+VALIDATION_BATCH_SIZE = 64
+
+# Write buffer for the aria2c input file
+INPUT_FILE_BUFFER_SIZE = 1 << 20
+
+# Seconds between status polls of an aria2c RPC daemon
+RPC_POLL_INTERVAL = 1.0
+
+# Calls per system.multicall request. An addUri with its options is ~400
+# bytes, so this stays well under aria2c's default 2 MB --rpc-max-request-size
+RPC_BATCH_SIZE = 1000
+
 
 @dataclass
 class DownloadResult:
@@ -23,16 +57,45 @@ class DownloadResult:
     integrity_retries: int = 0
 
 
+def scan_download_dir(download_dir: Path) -> dict[str, os.stat_result]:
+    """List regular files in the download directory with one os.scandir pass.
+
+    Returns {filename: stat_result}; a missing directory yields an empty dict.
+    Entries that vanish or can't be stat'ed mid-scan are left out (and so
+    re-downloaded) without discarding the rest of the listing.
+    """
+    local_files: dict[str, os.stat_result] = {}
+    try:
+        with os.scandir(download_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        local_files[entry.name] = entry.stat()
+                except OSError:
+                    continue  # Removed or unreadable since readdir
+    except FileNotFoundError:
+        return {}
+    return local_files
+
+
 def get_files_to_download(
     file_paths: list[str],
     base_url: str,
     download_dir: Path,
     on_progress: Callable[[int, int], None] | None = None,
+    progress_interval: int | None = 1,
+    local_files: dict[str, os.stat_result] | None = None,
 ) -> tuple[list[tuple[str, str]], dict[str, int]]:
     """Determine which files need to be downloaded by checking local existence.
 
     Trust local files: if a file exists with size > 0, it's considered complete.
-    No HEAD requests are made - this is reliable and fast.
+    No HEAD requests are made - this is reliable and fast. The download
+    directory is listed once up front so each file is a dict lookup rather
+    than a separate exists()/stat() pair; pass local_files to reuse an
+    existing scan_download_dir() result.
+
+    on_progress is called every progress_interval files and once at the end;
+    None picks an interval giving about PROGRESS_UPDATES_PER_PASS updates.
 
     Returns:
         - list of (url, local_filename) tuples for files that need downloading
@@ -42,24 +105,30 @@ def get_files_to_download(
     updated_cache: dict[str, int] = {}
     total = len(file_paths)
 
-    for i, relative_path in enumerate(file_paths):
-        filename = os.path.basename(relative_path)
-        local_path = download_dir / filename
-        url = f"{base_url}{relative_path}"
-
-        if local_path.exists():
-            local_size = local_path.stat().st_size
-            if local_size > 0:
+    if local_files is None:
+        local_files = scan_download_dir(download_dir)
+    if on_progress is None:
+        # Nobody is listening, so walk the whole manifest as one chunk
+        progress_interval = max(1, total)
+    elif progress_interval is None:
+        progress_interval = max(1, total // PROGRESS_UPDATES_PER_PASS)
+
+    # Walk the manifest one progress chunk at a time, so the inner loop has
+    # no progress bookkeeping and URLs are only built for files to download
+    lookup = local_files.get
+    for start in range(0, total, progress_interval):
+        for relative_path in file_paths[start:start + progress_interval]:
+            filename = relative_path.rpartition("/")[2]
+            stat_result = lookup(filename)
+            if stat_result is not None and stat_result.st_size > 0:
                 # File exists and has content - trust it
-                updated_cache[filename] = local_size
-                if on_progress:
-                    on_progress(i + 1, total)
-                continue
+                updated_cache[filename] = stat_result.st_size
+            else:
+                # File missing or empty - needs download
+                to_download.append((base_url + relative_path, filename))
 
-        # File missing or empty - needs download
-        to_download.append((url, filename))
         if on_progress:
-            on_progress(i + 1, total)
+            on_progress(min(start + progress_interval, total), total)
 
     return to_download, updated_cache
 
@@ -68,18 +137,19 @@ def load_session_urls(session_file: Path) -> set[str]:
     """Load URLs from existing aria2c session file.
 
     Session file format has URLs on lines that don't start with whitespace.
+    The file is memory-mapped and scanned with a single regex pass.
     """
     urls = set()
 
-    if not session_file.exists():
-        return urls
-
     try:
-        with open(session_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and line.startswith("http"):
-                    urls.add(line)
+        with open(session_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return urls  # mmap can't map an empty file
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # findall hands back bytes directly, no Match object per URL
+                urls = {url.decode() for url in _SESSION_URL_RE.findall(mm)}
+    except FileNotFoundError:
+        pass  # No previous run to resume
     except OSError as e:
         logger = get_logger()
         logger.debug("Failed to read session file %s: %s", session_file, e)
@@ -87,9 +157,15 @@ def load_session_urls(session_file: Path) -> set[str]:
     return urls
 
 
-def create_aria2c_input_file(files_to_download: list[tuple[str, str]]) -> Path:
+def create_aria2c_input_file(files_to_download: Iterable[tuple[str, str]]) -> Path:
     """Create aria2c input file with URLs and output filenames.
 
+    Entries are consumed lazily, so a generator can be streamed straight into
+    the file without first building the full list in memory.
+
+    The file is gzip-compressed (aria2c reads gzipped input files natively);
+    level 1 is nearly free and shrinks repetitive URL lists several-fold.
+
     aria2c input format:
     URL
       out=filename
@@ -97,101 +173,308 @@ def create_aria2c_input_file(files_to_download: list[tuple[str, str]]) -> Path:
       out=filename
     ...
     """
-    fd, path = tempfile.mkstemp(suffix=".txt", prefix="aria2c_input_")
-
-    with os.fdopen(fd, "w") as f:
-        for url, filename in files_to_download:
-            f.write(f"{url}\n")
-            f.write(f"  out={filename}\n")
+    fd, path = tempfile.mkstemp(suffix=".txt.gz", prefix="aria2c_input_")
+
+    # 1 MiB buffer under the compressor: a few large writes instead of many 8 KiB ones
+    with (
+        os.fdopen(fd, "wb", buffering=INPUT_FILE_BUFFER_SIZE) as raw,
+        gzip.open(raw, "wt", compresslevel=1) as f,
+    ):
+        f.writelines(
+            f"{url}\n  out={filename}\n" for url, filename in files_to_download
+        )
 
     return Path(path)
 
 
+def _file_signature(filepath: str | Path) -> tuple[int, int, int] | None:
+    """Return (size, mtime_ns, ctime_ns) for a file, or None if it can't be read.
+
+    ctime is included because aria2c's --remote-time resets mtime to the
+    server value, so a re-downloaded file can share size and mtime with the
+    copy it replaced.
+    """
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+def load_validation_cache(cache_file: Path) -> dict[str, tuple[int, int, int]]:
+    """Load the cache of files that previously passed integrity checks.
+
+    Returns {filename: (size, mtime_ns, ctime_ns)}; an unreadable cache is
+    treated as empty.
+    """
+    try:
+        with open(cache_file) as f:
+            data = json.load(f)
+        return {name: tuple(signature) for name, signature in data.items()}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        logger = get_logger()
+        logger.debug("Ignoring unreadable validation cache %s: %s", cache_file, e)
+        return {}
+
+
+def save_validation_cache(
+    cache_file: Path, validated: dict[str, tuple[int, int, int]]
+) -> None:
+    """Atomically write the validation cache (temp file + os.replace)."""
+    tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+    try:
+        with open(tmp_file, "w") as f:
+            json.dump(validated, f)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger = get_logger()
+        logger.debug("Failed to write validation cache %s: %s", cache_file, e)
+
+
+def _has_parquet_footer(filepath: str | Path) -> bool:
+    """Cheap structural check: PAR1 magic at both ends and a sane footer length.
+
+    Reads 12 bytes, so truncated or partial downloads are rejected without
+    building any pyarrow objects.
+    """
+    with open(filepath, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < 12:
+            return False
+        if f.read(4) != PARQUET_MAGIC:
+            return False
+        f.seek(-8, os.SEEK_END)
+        tail = f.read(8)
+    if tail[4:] != PARQUET_MAGIC:
+        return False
+    footer_length = int.from_bytes(tail[:4], "little")
+    return footer_length + 12 <= size
+
+
+def _validate_parquet_file(
+    download_dir: Path, filename: str, deep: bool = False
+) -> tuple[str, str, str | None]:
+    """Validate a single parquet file by reading its metadata and schema.
+
+    With deep set, every row group is also decoded with page CRC verification
+    enabled, catching corrupt column data that an intact footer would hide.
+
+    Lives at module scope so it can be pickled into worker processes; logging
+    and deleting corrupt files is left to the caller in the parent process.
+
+    Returns (filename, status, error) where status is one of "valid",
+    "skipped", "corrupt" or "error".
+    """
+    import pyarrow.parquet as pq
+    from pyarrow import ArrowInvalid
+
+    # Plain strings: no Path objects parsed per file on this hot path
+    if not filename.endswith(".parquet"):
+        return (filename, "skipped", None)  # Skip non-parquet files
+    filepath = os.path.join(download_dir, filename)
+    try:
+        if not _has_parquet_footer(filepath):
+            return (filename, "corrupt", "missing or truncated parquet footer")
+        # Validate file structure/footer; mapped, so the footer isn't copied
+        metadata = pq.read_metadata(filepath, memory_map=True)
+        # Validate column definitions from the already-parsed footer
+        metadata.schema.to_arrow_schema()
+        if deep:
+            parquet_file = pq.ParquetFile(
+                filepath,
+                metadata=metadata,
+                memory_map=True,
+                page_checksum_verification=True,
+            )
+            # One row group at a time keeps memory bounded by the largest group
+            for i in range(metadata.num_row_groups):
+                try:
+                    parquet_file.read_row_group(i)
+                except OSError as e:
+                    # pyarrow reports CRC mismatches as IO errors
+                    if "checksum" not in str(e):
+                        raise
+                    return (filename, "corrupt", str(e))
+        return (filename, "valid", None)
+    except FileNotFoundError:
+        return (filename, "skipped", None)  # Skip missing files
+    except ArrowInvalid as e:
+        return (filename, "corrupt", str(e))
+    except Exception as e:
+        # System error (permissions, memory, etc.)
+        return (filename, "error", str(e))
+
+
+def _validate_parquet_batch(
+    download_dir: Path, filenames: list[str], deep: bool = False
+) -> list[tuple[str, str, str | None]]:
+    """Validate a batch of parquet files in one worker task."""
+    return [
+        _validate_parquet_file(download_dir, filename, deep) for filename in filenames
+    ]
+
+
 def verify_parquet_integrity(
     download_dir: Path,
     filenames: list[str],
     on_progress: Callable[[int, int], None] | None = None,
     max_workers: int = 4,
+    use_processes: bool = False,
+    validated: dict[str, tuple[int, int, int]] | None = None,
+    deep: bool = False,
+    progress_interval: int | None = 1,
 ) -> list[str]:
     """Verify parquet files are valid by reading metadata and schema.
 
-    Uses ThreadPoolExecutor for concurrent validation.
+    Uses ThreadPoolExecutor for concurrent validation, or ProcessPoolExecutor
+    when use_processes is set. With deep set, column data is fully decoded
+    and page checksums verified as well (slow: reads every byte).
+
+    Files that still have an aria2 control file (download in progress) are
+    skipped.
+
+    on_progress is called every progress_interval files and once at the end;
+    None picks an interval giving about PROGRESS_UPDATES_PER_PASS updates.
+
+    If a validated cache is given, files whose stat signature matches a
+    previous successful check are skipped, and newly validated files are
+    recorded in it.
+
     Returns list of filenames that failed validation (corrupt files are deleted).
     """
-    import pyarrow.parquet as pq
-    from pyarrow import ArrowInvalid
-
+    logger = get_logger()
     failed: list[str] = []
-    failed_lock = threading.Lock()
-    progress_counter = 0
-    progress_lock = threading.Lock()
     total = len(filenames)
+    signatures: dict[str, tuple[int, int, int]] = {}
 
-    def validate_single_file(filename: str) -> tuple[str, bool]:
-        """Validate a single parquet file. Returns (filename, is_valid)."""
-        filepath = download_dir / filename
-        if not filepath.exists() or filepath.suffix != ".parquet":
-            return (filename, True)  # Skip non-parquet or missing files
-        # Skip files with active aria2 control files (incomplete downloads)
-        aria2_control = filepath.with_suffix(filepath.suffix + ".aria2")
-        if aria2_control.exists():
-            return (filename, True)  # Skip - download still in progress
-        try:
-            pq.read_metadata(filepath)  # Validate file structure/footer
-            pq.read_schema(filepath)  # Validate column definitions
-            return (filename, True)
-        except ArrowInvalid as e:
-            # Parquet file is corrupt - delete and retry
-            logger = get_logger()
-            logger.warning("Parquet file corrupt %s: %s", filename, e)
-            try:
-                filepath.unlink()
-            except OSError as unlink_err:
-                logger.debug("Failed to delete corrupt file %s: %s", filename, unlink_err)
-            return (filename, False)
-        except Exception as e:
-            # System error (permissions, memory, etc.) - don't delete, just report
-            logger = get_logger()
-            logger.error("Failed to validate %s (not deleting): %s", filename, e)
-            return (filename, False)
-
-    def update_progress() -> None:
-        """Thread-safe progress update."""
-        nonlocal progress_counter
-        with progress_lock:
-            progress_counter += 1
-            current = progress_counter
-        if on_progress:
-            on_progress(current, total)
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(validate_single_file, filename): filename
-            for filename in filenames
+    # Skip files with active aria2 control files (incomplete downloads),
+    # found with one directory listing rather than a stat per file
+    try:
+        in_progress = {
+            name[:-len(".aria2")]
+            for name in os.listdir(download_dir)
+            if name.endswith(".aria2")
         }
-        for future in as_completed(futures):
-            filename, is_valid = future.result()
-            if not is_valid:
-                with failed_lock:
-                    failed.append(filename)
-            update_progress()
+    except FileNotFoundError:
+        in_progress = set()
+    if in_progress:
+        filenames = [filename for filename in filenames if filename not in in_progress]
+
+    if validated is not None:
+        to_check: list[str] = []
+        for filename in filenames:
+            signature = _file_signature(os.path.join(download_dir, filename))
+            if signature is not None and validated.get(filename) == signature:
+                continue
+            if signature is not None:
+                signatures[filename] = signature
+            to_check.append(filename)
+        filenames = to_check
+
+    # Files settled without a worker (in progress or cached) count as done
+    done = total - len(filenames)
+    if done and on_progress:
+        on_progress(done, total)
+    if progress_interval is None:
+        progress_interval = max(1, total // PROGRESS_UPDATES_PER_PASS)
+
+    if use_processes:
+        # forkserver avoids forking a parent that already runs threads
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    # Hand each worker batches of files so per-task dispatch overhead
+    # (futures, queues, pickling) is paid per batch rather than per file
+    batch_size = min(
+        VALIDATION_BATCH_SIZE, max(1, len(filenames) // (max_workers * 4))
+    )
+    batches = [
+        filenames[i:i + batch_size] for i in range(0, len(filenames), batch_size)
+    ]
+
+    with executor:
+        results = chain.from_iterable(
+            executor.map(
+                _validate_parquet_batch, repeat(download_dir), batches, repeat(deep)
+            )
+        )
+        for completed, (filename, status, error) in enumerate(results, done + 1):
+            if status == "valid":
+                if validated is not None and filename in signatures:
+                    validated[filename] = signatures[filename]
+            elif status == "corrupt":
+                # Parquet file is corrupt - delete and retry
+                logger.warning("Parquet file corrupt %s: %s", filename, error)
+                try:
+                    (download_dir / filename).unlink()
+                except OSError as unlink_err:
+                    logger.debug("Failed to delete corrupt file %s: %s", filename, unlink_err)
+                failed.append(filename)
+                if validated is not None:
+                    validated.pop(filename, None)
+            elif status == "error":
+                # System error - don't delete, just report
+                logger.error("Failed to validate %s (not deleting): %s", filename, error)
+                failed.append(filename)
+            if on_progress and (completed % progress_interval == 0 or completed == total):
+                on_progress(completed, total)
 
     return failed
 
 
+def create_completion_hook(completed_log: Path) -> Path:
+    """Create an aria2c --on-download-complete hook script.
+
+    aria2c runs the hook as `hook GID NUM_FILES PATH`; the script appends
+    PATH to completed_log so files can be validated while others download.
+    """
+    fd, path = tempfile.mkstemp(suffix=".sh", prefix="aria2c_hook_")
+
+    with os.fdopen(fd, "w") as f:
+        f.write("#!/bin/sh\n")
+        f.write(f"printf '%s\\n' \"$3\" >> {shlex.quote(str(completed_log))}\n")
+    os.chmod(path, 0o700)
+
+    return Path(path)
+
+
 def run_aria2c(
     config: Config,
     input_file: Path,
+    completed_log: Path | None = None,
 ) -> int:
     """Run aria2c with the given input file.
 
+    If completed_log is given, aria2c appends the path of each finished file
+    to it through an --on-download-complete hook.
+
+    If config.aria2c_rpc_url is set, the downloads are handed to a running
+    aria2c daemon over JSON-RPC instead (see run_aria2c_rpc).
+
     Returns aria2c exit code.
     """
     config.download_dir.mkdir(parents=True, exist_ok=True)
 
+    if config.aria2c_rpc_url:
+        return run_aria2c_rpc(config, input_file, completed_log=completed_log)
+
+    # subprocess only uses posix_spawn (instead of fork+exec, which copies
+    # the page tables of this pyarrow-sized process) for executables given
+    # with a directory component, so resolve bare names through PATH first.
+    aria2c = shutil.which(config.aria2c_path) or config.aria2c_path
+
     cmd = [
-        config.aria2c_path,
+        aria2c,
         "-c",  # Continue/resume partial downloads
+        # No --conditional-get: only missing or empty files reach aria2c, and an
+        # empty file's fresh mtime would turn its download into a 304 no-op
+        "--remote-time=true",  # Keep server modification time on local files
         f"--save-session={config.session_file}",  # Save state on exit
         "--save-session-interval=10",  # Save every 10 seconds
         f"-j{config.concurrent_downloads}",  # Concurrent downloads
@@ -199,14 +482,249 @@ def run_aria2c(
         "--auto-file-renaming=false",  # Don't rename on conflict
         "--console-log-level=notice",  # Show progress
         "--summary-interval=5",  # Summary every 5 seconds
-        #    "--file-allocation=falloc",  # It is recommended for newer file systems like ext4 (with extents enabled), btrfs, or xfs
+        "--disk-cache=0",  # Kernel page cache is enough; saves 16 MB per process
+        "--file-allocation=none",  # Preallocation only slows down small files
+        "--optimize-concurrent-downloads=true",  # Adapt concurrency to bandwidth
+        f"--max-connection-per-server={min(16, config.concurrent_downloads)}",
+        "--min-split-size=1M",  # Allow splitting mid-sized files across connections
         f"-i{input_file}",  # Input file
     ]
 
-    result = subprocess.run(cmd)
+    hook = None
+    if completed_log is not None:
+        hook = create_completion_hook(completed_log)
+        cmd.append(f"--on-download-complete={hook}")  # Report finished files
+
+    try:
+        result = subprocess.run(cmd)
+    finally:
+        if hook is not None:
+            hook.unlink(missing_ok=True)
     return result.returncode
 
 
+def read_aria2c_input_file(input_file: Path) -> list[tuple[str, str]]:
+    """Read (url, filename) pairs back from a create_aria2c_input_file() file."""
+    entries: list[tuple[str, str]] = []
+    url = None
+    with gzip.open(input_file, "rt") as f:
+        for line in f:
+            if not line[:1].isspace():
+                url = line.strip() or None
+            elif url is not None and line.strip().startswith("out="):
+                entries.append((url, line.strip()[4:]))
+                url = None
+    return entries
+
+
+def _aria2c_rpc_call(
+    client: httpx.Client, config: Config, calls: list[tuple[str, list]]
+) -> list:
+    """Send calls as system.multicall requests and return the per-call results.
+
+    Calls are sent RPC_BATCH_SIZE at a time, so no request outgrows the
+    daemon's --rpc-max-request-size. Failed calls come back as
+    {"code": ..., "message": ...} fault dicts.
+    """
+    token = [f"token:{config.aria2c_rpc_secret}"] if config.aria2c_rpc_secret else []
+    results: list = []
+    for start in range(0, len(calls), RPC_BATCH_SIZE):
+        payload = {
+            "jsonrpc": "2.0",
+            "id": "sourcify-sync",
+            "method": "system.multicall",
+            "params": [
+                [
+                    {"methodName": method, "params": token + params}
+                    for method, params in calls[start:start + RPC_BATCH_SIZE]
+                ]
+            ],
+        }
+        response = client.post(config.aria2c_rpc_url, json=payload)
+        response.raise_for_status()
+        body = response.json()
+        if "error" in body:
+            raise RuntimeError(body["error"].get("message", "aria2c RPC error"))
+        results.extend(
+            result[0] if isinstance(result, list) else result
+            for result in body["result"]
+        )
+    return results
+
+
+def run_aria2c_rpc(
+    config: Config,
+    input_file: Path,
+    completed_log: Path | None = None,
+) -> int:
+    """Queue the input file's downloads on a running aria2c daemon.
+
+    Files are added with batched system.multicall requests. Each poll then
+    lists the daemon's active and waiting downloads in one small request, and
+    only asks for the status of our downloads that left both lists. A
+    long-lived daemon keeps its connections and TLS sessions alive across
+    runs. Finished files are appended to completed_log, like the
+    --on-download-complete hook does.
+
+    Returns 0 when every download completed, else the first aria2c error code
+    (1 if the daemon could not be reached).
+    """
+    logger = get_logger()
+    options = {
+        "dir": str(config.download_dir),
+        "continue": "true",
+        "remote-time": "true",
+        "auto-file-renaming": "false",
+        "max-connection-per-server": str(min(16, config.concurrent_downloads)),
+        "min-split-size": "1M",
+    }
+    entries = read_aria2c_input_file(input_file)
+    if not entries:
+        return 0
+
+    try:
+        with httpx.Client(timeout=30.0) as client:
+            added = _aria2c_rpc_call(
+                client,
+                config,
+                [
+                    ("aria2.addUri", [[url], {**options, "out": filename}])
+                    for url, filename in entries
+                ],
+            )
+            exit_code = 0
+            pending: dict[str, str] = {}
+            for (_, filename), gid in zip(entries, added):
+                if isinstance(gid, str):
+                    pending[gid] = filename
+                else:
+                    logger.error("aria2c rejected %s: %s", filename, gid.get("message"))
+                    exit_code = exit_code or 1
+
+            while pending:
+                time.sleep(RPC_POLL_INTERVAL)
+                active, waiting = _aria2c_rpc_call(
+                    client,
+                    config,
+                    [
+                        ("aria2.tellActive", [["gid"]]),
+                        ("aria2.tellWaiting", [0, len(pending), ["gid"]]),
+                    ],
+                )
+                if not (isinstance(active, list) and isinstance(waiting, list)):
+                    raise RuntimeError("aria2c could not list downloads")
+                unfinished = {item["gid"] for item in chain(active, waiting)}
+                gids = [gid for gid in pending if gid not in unfinished]
+                if not gids:
+                    continue
+                statuses = _aria2c_rpc_call(
+                    client,
+                    config,
+                    [("aria2.tellStatus", [gid, ["status", "errorCode"]]) for gid in gids],
+                )
+                finished: list[str] = []
+                for gid, status in zip(gids, statuses):
+                    state = status.get("status")
+                    if state in ("active", "waiting", "paused"):
+                        continue
+                    filename = pending.pop(gid)
+                    if state == "complete":
+                        finished.append(filename)
+                    else:
+                        logger.warning("Download %s ended as %s", filename, state)
+                        exit_code = exit_code or int(status.get("errorCode") or 1)
+                if finished and completed_log is not None:
+                    with open(completed_log, "a") as f:
+                        f.writelines(
+                            f"{config.download_dir / filename}\n" for filename in finished
+                        )
+    except (httpx.HTTPError, RuntimeError) as e:
+        logger.error("aria2c RPC request to %s failed: %s", config.aria2c_rpc_url, e)
+        return 1
+
+    return exit_code
+
+
+def validate_completed_downloads(
+    config: Config,
+    completed_log: Path,
+    stop: threading.Event,
+    validated: dict[str, tuple[int, int, int]],
+    failed: list[str],
+    poll_interval: float = 1.0,
+) -> None:
+    """Validate files as aria2c reports them complete, until stop is set.
+
+    Runs in a background thread next to aria2c. Failed filenames are appended
+    to failed; valid ones are recorded in validated so the post-download pass
+    can skip them.
+    """
+    offset = 0
+
+    while True:
+        stopping = stop.wait(poll_interval)
+        try:
+            with open(completed_log, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except OSError:
+            data = b""
+
+        # Only consume whole lines; aria2c may still be writing the last one
+        end = data.rfind(b"\n") + 1
+        offset += end
+        filenames = [
+            os.path.basename(line)
+            for line in data[:end].decode().splitlines()
+            if line
+        ]
+        if filenames:
+            failed.extend(
+                verify_parquet_integrity(
+                    config.download_dir,
+                    filenames,
+                    max_workers=config.concurrent_validations,
+                    validated=validated,
+                    deep=config.deep_integrity,
+                )
+            )
+
+        if stopping:
+            return
+
+
+def _run_aria2c_with_validation(
+    config: Config,
+    input_file: Path,
+    validated: dict[str, tuple[int, int, int]],
+) -> tuple[int, list[str]]:
+    """Run aria2c while validating finished files in a background thread.
+
+    Returns (aria2c exit code, filenames that failed validation early).
+    """
+    fd, path = tempfile.mkstemp(suffix=".log", prefix="aria2c_completed_")
+    os.close(fd)
+    completed_log = Path(path)
+
+    early_failures: list[str] = []
+    stop = threading.Event()
+    watcher = threading.Thread(
+        target=validate_completed_downloads,
+        args=(config, completed_log, stop, validated, early_failures),
+        daemon=True,
+    )
+    watcher.start()
+
+    try:
+        exit_code = run_aria2c(config, input_file, completed_log=completed_log)
+    finally:
+        stop.set()
+        watcher.join()
+        completed_log.unlink(missing_ok=True)
+
+    return exit_code, early_failures
+
+
 def download_files_impl(
     config: Config,
     file_paths: list[str],
@@ -220,21 +738,36 @@ def download_files_impl(
     integrity_check: bool = True,
     run_integrity: bool = False,
     dry_run: bool = False,
+    verify_progress_interval: int | None = 1,
+    integrity_progress_interval: int | None = 1,
 ) -> DownloadResult:
     """Download files using aria2c with robust resume support and integrity checking.
 
     Returns DownloadResult with statistics.
     """
     total_files = len(file_paths)
+    # The cache only vouches for footer checks, so a deep run starts empty
+    # and leaves the on-disk cache untouched rather than overwriting it
+    validated = (
+        {} if config.deep_integrity
+        else load_validation_cache(config.validation_cache_file)
+    )
+    # Canonical filename -> URL map, used for session merging and retries
+    base_url = config.base_url
+    manifest_urls: dict[str, str] = {
+        p.rpartition("/")[2]: base_url + p for p in file_paths
+    }
+
+    # One directory listing shared by the pre-integrity filter and verify stage
+    local_files = scan_download_dir(config.download_dir)
 
     # Run pre-download integrity check if requested (skip in dry-run mode)
     if run_integrity and not dry_run:
         config.download_dir.mkdir(parents=True, exist_ok=True)
         # Only validate files that are in the manifest (safe to delete and re-download)
-        manifest_filenames = {os.path.basename(p) for p in file_paths}
         existing_files = [
-            f.name for f in config.download_dir.glob("*.parquet")
-            if f.is_file() and f.name in manifest_filenames
+            name for name in local_files
+            if name.endswith(".parquet") and name in manifest_urls
         ]
         if existing_files:
             if on_integrity_start:
@@ -244,8 +777,17 @@ def download_files_impl(
                 config.download_dir,
                 existing_files,
                 on_progress=on_integrity_progress,
+                progress_interval=integrity_progress_interval,
                 max_workers=config.concurrent_validations,
+                use_processes=config.validation_processes,
+                validated=validated,
+                deep=config.deep_integrity,
             )
+            if not config.deep_integrity:
+                save_validation_cache(config.validation_cache_file, validated)
+            # Corrupt files were deleted; keep the shared listing in sync
+            for filename in failed:
+                local_files.pop(filename, None)
 
             if on_integrity_complete:
                 on_integrity_complete(len(failed))
@@ -259,6 +801,8 @@ def download_files_impl(
         config.base_url,
         config.download_dir,
         on_progress=on_verify_progress,
+        progress_interval=verify_progress_interval,
+        local_files=local_files,
     )
 
     # Load any incomplete downloads from previous session
@@ -271,6 +815,7 @@ def download_files_impl(
             # Extract filename from URL
             filename = os.path.basename(session_url)
             files_to_download.append((session_url, filename))
+            manifest_urls.setdefault(filename, session_url)
 
     if on_verify_complete:
         on_verify_complete(len(files_to_download))
@@ -299,20 +844,22 @@ def download_files_impl(
             aria2c_exit_code=0,
         )
 
-    # Build URL lookup for re-downloads
-    url_by_filename: dict[str, str] = {
-        filename: url for url, filename in files_to_download
-    }
-
     exit_code = 0
     integrity_retries = 0
     permanent_failures: list[str] = []
 
     while files_to_download:
         input_file = create_aria2c_input_file(files_to_download)
+        early_failures: list[str] = []
 
         try:
-            exit_code = run_aria2c(config, input_file)
+            if integrity_check:
+                # Validate files as they finish instead of after aria2c exits
+                exit_code, early_failures = _run_aria2c_with_validation(
+                    config, input_file, validated
+                )
+            else:
+                exit_code = run_aria2c(config, input_file)
         finally:
             input_file.unlink(missing_ok=True)
 
@@ -334,8 +881,18 @@ def download_files_impl(
             config.download_dir,
             downloaded_filenames,
             on_progress=on_integrity_progress,
+            progress_interval=integrity_progress_interval,
             max_workers=config.concurrent_validations,
+            use_processes=config.validation_processes,
+            validated=validated,
+            deep=config.deep_integrity,
         )
+        if not config.deep_integrity:
+            save_validation_cache(config.validation_cache_file, validated)
+        # Corrupt files caught early were deleted, so the pass above skips them
+        failed_files = early_failures + [
+            filename for filename in failed_files if filename not in early_failures
+        ]
 
         if on_integrity_complete:
             on_integrity_complete(len(failed_files))
@@ -353,9 +910,9 @@ def download_files_impl(
 
         # Rebuild download list for failed files
         files_to_download = [
-            (url_by_filename[filename], filename)
+            (manifest_urls[filename], filename)
             for filename in failed_files
-            if filename in url_by_filename
+            if filename in manifest_urls
         ]
 
     # Clean up session file if download completed successfully
@@ -385,6 +942,8 @@ def download_files(
     run_integrity: bool = False,
     max_integrity_retries: int = 3,
     dry_run: bool = False,
+    verify_progress_interval: int | None = 1,
+    integrity_progress_interval: int | None = 1,
 ) -> DownloadResult:
     """Download files, checking local existence to determine what needs downloading."""
     return download_files_impl(
@@ -400,4 +959,6 @@ def download_files(
         integrity_check=integrity_check,
         run_integrity=run_integrity,
         dry_run=dry_run,
+        verify_progress_interval=verify_progress_interval,
+        integrity_progress_interval=integrity_progress_interval,
     )
@@ -1,9 +1,36 @@
 """Logging configuration for sourcify-sync."""
 
+import atexit
 import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+# ANSI "erase in line" (cursor to end), clears leftovers of a longer previous line
+CSI_ERASE_LINE_AFTER = "\x1b[K"
+
+# Only emit ANSI sequences when stdout is a terminal, so redirected output stays clean
+_PROGRESS_SUFFIX = CSI_ERASE_LINE_AFTER if sys.stdout.isatty() else ""
+
+# Background listener that owns the log file handler (see setup_logging)
+_file_listener: QueueListener | None = None
+
+
+def _stop_file_listener() -> None:
+    """Flush queued records to the log file and close it."""
+    global _file_listener
+    if _file_listener is None:
+        return
+    _file_listener.stop()
+    for handler in _file_listener.handlers:
+        handler.close()
+    _file_listener = None
+
+
+atexit.register(_stop_file_listener)
+
 
 def setup_logging(
     verbosity: int = 0,
@@ -11,6 +38,9 @@ def setup_logging(
 ) -> logging.Logger:
     """Configure and return the logger for sourcify-sync.
 
+    Log file writes are handed to a background QueueListener thread, so
+    worker threads that log never block on (or contend for) the file.
+
     Args:
         verbosity: -1 for quiet (WARNING+), 0 for normal (INFO), 1 for verbose (DEBUG)
         log_file: Optional path to write logs to file
@@ -19,10 +49,10 @@ def setup_logging(
         Configured logger instance
     """
     logger = logging.getLogger("sourcify_sync")
-    logger.setLevel(logging.DEBUG)
 
     # Clear any existing handlers
     logger.handlers.clear()
+    _stop_file_listener()
 
     # Console handler with level based on verbosity
     console_handler = logging.StreamHandler(sys.stdout)
@@ -50,7 +80,21 @@ def setup_logging(
             datefmt="%Y-%m-%d %H:%M:%S",
         )
         file_handler.setFormatter(file_fmt)
-        logger.addHandler(file_handler)
+
+        global _file_listener
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setLevel(logging.DEBUG)
+        _file_listener = QueueListener(
+            log_queue, file_handler, respect_handler_level=True
+        )
+        queue_handler.listener = _file_listener
+        _file_listener.start()
+        logger.addHandler(queue_handler)
+
+    # Filter at the logger so records no handler wants (e.g. DEBUG in quiet
+    # mode) are dropped before a LogRecord is built or arguments formatted
+    logger.setLevel(min(handler.level for handler in logger.handlers))
 
     return logger
 
@@ -64,7 +108,37 @@ def write_progress(message: str) -> None:
     """Write a progress bar update directly to terminal.
 
     This bypasses logging entirely for progress updates that use
-    carriage return for in-place updates.
+    carriage return for in-place updates. On a terminal the rest of the line
+    is erased after the message instead of relying on a full-width redraw.
+
+    When stdout has a real file descriptor the update is pre-encoded and sent
+    with a single os.write(), skipping the TextIOWrapper encode/lock path.
     """
-    sys.stdout.write(f"\r{message}")
-    sys.stdout.flush()
+    _write_terminal(f"\r{message}{_PROGRESS_SUFFIX}")
+
+
+def end_progress() -> None:
+    """Finish the current progress bar line.
+
+    Goes through the same path as write_progress, so the newline can't be
+    reordered against the bar the way a buffered print() could.
+    """
+    _write_terminal("\n")
+
+
+def _write_terminal(data: str) -> None:
+    """Write data to stdout, with one os.write() when it has a descriptor."""
+    stream = sys.stdout
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        # No real descriptor (e.g. StringIO) - use the stream itself
+        stream.write(data)
+        stream.flush()
+        return
+
+    stream.flush()  # Keep ordering with anything already buffered
+    try:
+        os.write(fd, data.encode(stream.encoding or "utf-8", "replace"))
+    except OSError:
+        pass  # stdout closed (e.g. during interpreter shutdown)
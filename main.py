@@ -2,15 +2,20 @@
 
 import argparse
 import sys
+import time
+from collections.abc import Callable
 from pathlib import Path
 
+import httpx
+
 from config import Config
 from downloader import download_files
-from logging_setup import get_logger, setup_logging, write_progress
+from logging_setup import end_progress, get_logger, setup_logging, write_progress
 from manifest import extract_file_paths, fetch_manifest
 
 
-def parse_args() -> argparse.Namespace:
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
     parser = argparse.ArgumentParser(
         description="Download files from Sourcify export manifest using aria2c",
     )
@@ -56,6 +61,24 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Number of concurrent parquet validations (default: CPU count)",
     )
+    parser.add_argument(
+        "--validation-processes",
+        action="store_true",
+        default=None,
+        help="Validate parquet files in worker processes instead of threads",
+    )
+    parser.add_argument(
+        "--deep-integrity",
+        action="store_true",
+        default=None,
+        help="Also decode all column data and verify page checksums (slow)",
+    )
+    parser.add_argument(
+        "--aria2c-rpc-url",
+        type=str,
+        default=None,
+        help="Send downloads to a running aria2c daemon (e.g. http://localhost:6800/jsonrpc)",
+    )
     parser.add_argument(
         "-n", "--dry-run",
         action="store_true",
@@ -82,7 +105,55 @@ def parse_args() -> argparse.Namespace:
         help="Write logs to file (always DEBUG level)",
     )
 
-    return parser.parse_args()
+    return parser
+
+
+# Built once at import; parse_args() only parses
+_PARSER = _build_parser()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse CLI arguments from argv (defaults to sys.argv[1:])."""
+    return _PARSER.parse_args(argv)
+
+
+def make_progress_callback(
+    label: str,
+    bar_width: int = 40,
+    min_interval: float = 0.05,
+) -> Callable[[int, int], None]:
+    """Return a progress-bar callback that only redraws when it visibly changes.
+
+    The bar is redrawn when it gains a cell, when min_interval seconds have
+    passed since the last draw (so the counter keeps moving), or on the final
+    update. This keeps terminal writes at roughly bar_width per pass instead
+    of one per file.
+    """
+    last_filled = -1
+    last_draw = 0.0
+    # Every possible bar, so a redraw is a tuple lookup instead of building strings
+    bars = tuple(
+        "█" * filled + "░" * (bar_width - filled) for filled in range(bar_width + 1)
+    )
+    # Closure cells instead of global + attribute lookups on every call
+    monotonic = time.monotonic
+    draw = write_progress
+
+    def on_progress(completed: int, total: int) -> None:
+        nonlocal last_filled, last_draw
+        filled = completed * bar_width // total
+        now = monotonic()
+        if (
+            filled == last_filled
+            and completed != total
+            and now - last_draw < min_interval
+        ):
+            return
+        last_filled = filled
+        last_draw = now
+        draw(f"{label}: [{bars[filled]}] {completed}/{total}")
+
+    return on_progress
 
 
 def main() -> int:
@@ -101,6 +172,9 @@ def main() -> int:
         concurrency_override=args.concurrency,
         integrity_retry_count_override=args.integrity_retries,
         concurrent_validations_override=args.concurrent_validations,
+        validation_processes_override=args.validation_processes,
+        deep_integrity_override=args.deep_integrity,
+        aria2c_rpc_url_override=args.aria2c_rpc_url,
     )
 
     logger.info("Manifest URL: %s", config.manifest_url)
@@ -109,6 +183,11 @@ def main() -> int:
     logger.info("Integrity check: %s", "enabled" if config.integrity_check else "disabled")
     logger.info("Integrity retries: %s", config.integrity_retry_count)
     logger.info("Concurrent validations: %s", config.concurrent_validations)
+    logger.debug("Validation workers: %s", "processes" if config.validation_processes else "threads")
+    if config.deep_integrity:
+        logger.info("Deep integrity check: enabled")
+    if config.aria2c_rpc_url:
+        logger.info("aria2c RPC daemon: %s", config.aria2c_rpc_url)
     if args.run_integrity:
         logger.info("Pre-download integrity check: enabled")
     if args.dry_run:
@@ -118,8 +197,8 @@ def main() -> int:
 
     logger.debug("Fetching manifest...")
     try:
-        manifest = fetch_manifest(config.manifest_url)
-    except Exception as e:
+        manifest = fetch_manifest(config.manifest_url, cache_dir=config.download_dir)
+    except (httpx.HTTPError, OSError, ValueError) as e:
         logger.error("Error fetching manifest: %s", e)
         return 1
 
@@ -129,32 +208,22 @@ def main() -> int:
     def on_verify_start(total: int) -> None:
         logger.debug("Verifying files...")
 
-    def on_verify_progress(completed: int, total: int) -> None:
-        percent = completed / total
-        bar_width = 40
-        filled = int(bar_width * percent)
-        bar = "█" * filled + "░" * (bar_width - filled)
-        write_progress(f"Verifying: [{bar}] {completed}/{total}")
+    on_verify_progress = make_progress_callback("Verifying")
 
     def on_verify_complete(to_download: int) -> None:
-        print()  # Newline after progress bar
+        end_progress()
         logger.info("Found %d files to download", to_download)
         if to_download > 0 and not args.dry_run:
             logger.info("Starting download...")
 
     def on_integrity_start(total: int) -> None:
-        print()  # Newline before integrity check
+        end_progress()  # Newline before integrity check
         logger.debug("Verifying parquet file integrity...")
 
-    def on_integrity_progress(completed: int, total: int) -> None:
-        percent = completed / total
-        bar_width = 40
-        filled = int(bar_width * percent)
-        bar = "█" * filled + "░" * (bar_width - filled)
-        write_progress(f"Integrity: [{bar}] {completed}/{total}")
+    on_integrity_progress = make_progress_callback("Integrity")
 
     def on_integrity_complete(failed: int) -> None:
-        print()  # Newline after progress bar
+        end_progress()
         if failed > 0:
             logger.warning("Found %d corrupt files, re-downloading...", failed)
         else:
@@ -173,6 +242,8 @@ def main() -> int:
         run_integrity=args.run_integrity,
         max_integrity_retries=config.integrity_retry_count,
         dry_run=args.dry_run,
+        verify_progress_interval=None,  # Scale with manifest size
+        integrity_progress_interval=None,
     )
 
     logger.info("")
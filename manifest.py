@@ -1,40 +1,210 @@
 """Manifest fetching and parsing for sourcify-sync."""
 
+import asyncio
+import atexit
+import hashlib
+import json
 import logging
+import os
+import re
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
 
 import httpx
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; stdlib json parses bytes too
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401  (httpx's optional HTTP/2 backend)
+
+    _HTTP2 = True
+except ImportError:  # h2 is optional; HTTP/1.1 keep-alive still pools connections
+    _HTTP2 = False
+
+# Shared client so repeated fetches reuse the pooled connection and TLS session
+_CLIENT = httpx.Client(http2=_HTTP2, timeout=30.0)
+atexit.register(_CLIENT.close)
+
+# Windows drive prefix (C:\, C:/ or drive-relative C:)
+_WIN_DRIVE = re.compile(r"[A-Za-z]:")
+
+# Everything validate_path rejects, as one regex for bulk filtering: empty,
+# rooted (/ or \), drive-prefixed, or containing a ".." component.
+# Must stay in sync with validate_path (tests check they agree).
+_BAD = re.compile(r"\A(?:[/\\]|[A-Za-z]:|\Z)|(?:\A|[/\\])\.\.(?:[/\\]|\Z)")
+
+# First directory of a nested path, splitting on / or \ like _BAD does
+_TOP_DIR = re.compile(r"([^/\\]*)[/\\]")
+
+# Index of cached manifest bodies, kept in the cache directory:
+# {manifest_url: {"etag": ..., "last_modified": ..., "body": filename}}
+MANIFEST_CACHE_INDEX = ".manifest-cache.json"
+
+# In-process memo of parsed manifests: {manifest_url: (fetched_at, manifest)}
+MANIFEST_TTL = 60.0  # Seconds a parsed manifest is reused without a request
+MANIFEST_MEMO_SIZE = 32
+_memo: dict[str, tuple[float, Mapping]] = {}
+
+# Shared read-only stand-in for a missing "files" key (never mutated)
+_EMPTY: dict = {}
+
 
 def validate_path(path: str) -> bool:
     """Validate that a path doesn't contain directory traversal sequences.
 
     Rejects paths with:
-    - Parent directory references (..)
-    - Absolute Unix paths (starting with /)
+    - Parent directory references (.. as a component, with / or \\)
+    - Absolute Unix paths (starting with /) and UNC/rooted paths (\\)
     - Absolute Windows paths (e.g., C:\\)
+    - Empty paths
+
+    Names that merely contain dots (file..parquet) are allowed. Components
+    are only split out when ".." occurs, so the common path is one scan.
     """
-    # Reject paths with parent directory references
-    if ".." in path:
-        return False
-    # Reject absolute Unix paths
-    if path.startswith("/"):
-        return False
-    # Reject absolute Windows paths (e.g., C:\, D:\)
-    if len(path) > 1 and path[1] == ":":
+    if not path or path[0] in "/\\" or _WIN_DRIVE.match(path):
         return False
-    return True
+    return ".." not in path or ".." not in path.replace("\\", "/").split("/")
+
+
+def _load_cache_index(index_file: Path) -> dict:
+    """Load the manifest cache index, treating a missing or bad file as empty."""
+    try:
+        with open(index_file, "rb") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _store_cached_manifest(
+    cache_dir: Path,
+    manifest_url: str,
+    etag: str | None,
+    last_modified: str | None,
+    body: bytes,
+) -> None:
+    """Save a manifest body and its validators; failures only cost the next request."""
+    index_file = cache_dir / MANIFEST_CACHE_INDEX
+    url_hash = hashlib.sha256(manifest_url.encode()).hexdigest()[:16]
+    body_name = f".manifest-body-{url_hash}.json"
+    index = _load_cache_index(index_file)
+    index[manifest_url] = {
+        "etag": etag,
+        "last_modified": last_modified,
+        "body": body_name,
+    }
+    try:
+        (cache_dir / body_name).write_bytes(body)
+        tmp_file = index_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(index))
+        os.replace(tmp_file, index_file)
+    except OSError as e:
+        logger.debug("Failed to cache manifest in %s: %s", cache_dir, e)
+
+
+def fetch_manifest(
+    manifest_url: str,
+    cache_dir: Path | None = None,
+    client: httpx.Client = _CLIENT,
+    max_age: float = MANIFEST_TTL,
+) -> Mapping:
+    """Fetch manifest JSON from the given URL.
+
+    The body is parsed straight from bytes (with orjson when installed),
+    skipping the intermediate str that response.json() decodes first.
 
+    With a cache_dir, the body is stored alongside its ETag/Last-Modified and
+    later requests send If-None-Match/If-Modified-Since; a 304 reuses the
+    stored copy instead of downloading the manifest again.
+
+    Requests go through client, the shared module client by default, so
+    repeated fetches reuse its pooled connections.
+
+    Parsed manifests are memoized per URL for max_age seconds (0 always
+    fetches) and returned as read-only mappings, since every caller shares
+    the same object. fetch_manifest.cache_clear() empties the memo.
+    """
+    now = time.monotonic()
+    memoized = _memo.get(manifest_url)
+    if memoized is not None and now - memoized[0] < max_age:
+        return memoized[1]
+
+    manifest = MappingProxyType(_fetch_manifest(manifest_url, cache_dir, client))
+    _memo.pop(manifest_url, None)  # Re-insert as the most recent entry
+    _memo[manifest_url] = (now, manifest)
+    if len(_memo) > MANIFEST_MEMO_SIZE:
+        del _memo[next(iter(_memo))]  # Drop the oldest
+    return manifest
+
+
+fetch_manifest.cache_clear = _memo.clear  # type: ignore[attr-defined]
+
+
+def _fetch_manifest(
+    manifest_url: str, cache_dir: Path | None, client: httpx.Client
+) -> dict:
+    """Fetch and parse the manifest, revalidating any on-disk copy."""
+    entry = None
+    if cache_dir is not None:
+        entry = _load_cache_index(cache_dir / MANIFEST_CACHE_INDEX).get(manifest_url)
+
+    conditional_headers = {}
+    if entry:
+        if entry.get("etag"):
+            conditional_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            conditional_headers["If-Modified-Since"] = entry["last_modified"]
+
+    if conditional_headers:
+        response = client.get(manifest_url, headers=conditional_headers)
+        if response.status_code == 304:
+            try:
+                return _json_loads((cache_dir / entry["body"]).read_bytes())
+            except (OSError, ValueError) as e:
+                logger.debug("Cached manifest unusable, refetching: %s", e)
+                response = client.get(manifest_url)
+    else:
+        response = client.get(manifest_url)
 
-def fetch_manifest(manifest_url: str) -> dict:
-    """Fetch manifest JSON from the given URL."""
-    response = httpx.get(manifest_url, timeout=30.0)
     response.raise_for_status()
-    return response.json()
+    manifest = _json_loads(response.content)
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if cache_dir is not None and (etag or last_modified):
+        _store_cached_manifest(
+            cache_dir, manifest_url, etag, last_modified, response.content
+        )
 
+    return manifest
 
-def extract_file_paths(manifest: dict) -> list[str]:
+
+async def fetch_manifests(manifest_urls: list[str]) -> list[dict]:
+    """Fetch several manifests concurrently, returned in the order given.
+
+    All requests are in flight at once on one AsyncClient (multiplexed over
+    a single connection per host when h2 is installed), so N manifests cost
+    about one round trip instead of N. Bypasses the memo and disk cache.
+    """
+    async with httpx.AsyncClient(http2=_HTTP2, timeout=30.0) as client:
+        responses = await asyncio.gather(*(client.get(url) for url in manifest_urls))
+    manifests = []
+    for response in responses:
+        response.raise_for_status()
+        manifests.append(_json_loads(response.content))
+    return manifests
+
+
+def extract_file_paths(manifest: Mapping) -> list[str]:
     """Extract all file paths from manifest.
 
     The manifest structure is:
@@ -48,17 +218,43 @@ def extract_file_paths(manifest: dict) -> list[str]:
         }
     }
 
-    Returns a flat list of all file paths.
+    Returns a flat list of all file paths. Unsafe paths (see validate_path)
+    and nested paths whose first directory is not a category are dropped.
     """
-    files = manifest.get("files", {})
-    all_paths = []
+    files = manifest.get("files") or _EMPTY
+    # Parsed JSON only yields plain lists, so an identity check is enough
+    categories = [paths for paths in files.values() if type(paths) is list]
+
+    # Nested paths must live under one of the manifest's own categories; the
+    # keys view is a hash lookup on the path's first segment
+    allowed = files.keys()
 
-    for category, paths in files.items():
-        if isinstance(paths, list):
+    # One flat comprehension, one regex search per path (no validate_path() calls)
+    bad = _BAD.search
+    top = _TOP_DIR.match
+    all_paths = [
+        path
+        for paths in categories
+        for path in paths
+        if not bad(path)
+        and ((head := top(path)) is None or head[1] in allowed)
+    ]
+
+    # Invalid paths are rare; only pay for a second pass when there are some
+    if len(all_paths) != sum(map(len, categories)):
+        for paths in categories:
             for path in paths:
-                if validate_path(path):
-                    all_paths.append(path)
-                else:
+                if not validate_path(path):
                     logger.warning(f"Skipping invalid path: {path}")
+                elif (head := top(path)) is not None and head[1] not in allowed:
+                    logger.warning(f"Skipping path outside manifest categories: {path}")
 
     return all_paths
+
+
+def extract_file_paths_set(manifest: Mapping) -> frozenset[str]:
+    """Extract file paths as a frozenset for O(1) membership checks.
+
+    Same filtering as extract_file_paths, without order or duplicates.
+    """
+    return frozenset(extract_file_paths(manifest))
@@ -11,7 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import Config
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_manifest():
     """Sample manifest data for testing."""
     return {
@@ -31,7 +31,10 @@ def sample_manifest():
 
 @pytest.fixture
 def sample_config(tmp_path):
-    """Pre-configured Config instance for testing."""
+    """Pre-configured Config instance for testing.
+
+    Function-scoped because download_dir lives under the per-test tmp_path.
+    """
     return Config(
         manifest_url="https://example.com/manifest.json",
         download_dir=tmp_path / "downloads",
@@ -44,7 +47,7 @@ def sample_config(tmp_path):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def config_toml_content():
     """Sample config.toml content."""
     return """
@@ -1,7 +1,10 @@
 """Tests for config.py."""
 
+import dataclasses
 from pathlib import Path
 
+import pytest
+
 from config import Config, DEFAULTS
 
 
@@ -65,6 +68,55 @@ class TestConfigLoad:
 
         assert config.integrity_retry_count == 10
 
+    def test_validation_processes_cli_override(self, tmp_path):
+        """CLI override for validation_processes takes precedence."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("validation_processes = false\n")
+
+        config = Config.load(
+            config_path=config_file,
+            validation_processes_override=True,
+        )
+
+        assert config.validation_processes is True
+
+    def test_deep_integrity_cli_override(self, tmp_path):
+        """CLI override for deep_integrity takes precedence."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text("deep_integrity = false\n")
+
+        config = Config.load(
+            config_path=config_file,
+            deep_integrity_override=True,
+        )
+
+        assert config.deep_integrity is True
+
+    def test_aria2c_rpc_settings(self, tmp_path):
+        """RPC URL and secret load from the file; the URL can be overridden."""
+        config_file = tmp_path / "config.toml"
+        config_file.write_text(
+            'aria2c_rpc_url = "http://localhost:6800/jsonrpc"\n'
+            'aria2c_rpc_secret = "s3cret"\n'
+        )
+
+        config = Config.load(config_path=config_file)
+        assert config.aria2c_rpc_url == "http://localhost:6800/jsonrpc"
+        assert config.aria2c_rpc_secret == "s3cret"
+
+        config = Config.load(
+            config_path=config_file,
+            aria2c_rpc_url_override="http://daemon:6800/jsonrpc",
+        )
+        assert config.aria2c_rpc_url == "http://daemon:6800/jsonrpc"
+
+    def test_aria2c_rpc_unset_by_default(self, tmp_path):
+        """Without RPC settings aria2c is spawned per run."""
+        config = Config.load(config_path=tmp_path / "missing.toml")
+
+        assert config.aria2c_rpc_url is None
+        assert config.aria2c_rpc_secret is None
+
     def test_base_url_derived_from_manifest_url(self, tmp_path):
         """Base URL is correctly derived from manifest URL."""
         config = Config.load(
@@ -74,6 +126,19 @@ class TestConfigLoad:
 
         assert config.base_url == "https://export.sourcify.dev/path/to/"
 
+    def test_base_url_for_root_manifest(self, tmp_path):
+        """Manifest at the host root or without a path yields a root base URL."""
+        for manifest_url in (
+            "https://export.sourcify.dev/manifest.json",
+            "https://export.sourcify.dev",
+        ):
+            config = Config.load(
+                config_path=tmp_path / "nonexistent.toml",
+                manifest_url_override=manifest_url,
+            )
+
+            assert config.base_url == "https://export.sourcify.dev/"
+
     def test_download_dir_path_expansion(self, tmp_path):
         """Download directory with ~ is expanded."""
         config = Config.load(
@@ -92,3 +157,23 @@ class TestConfigProperties:
         """session_file returns correct path."""
         expected = sample_config.download_dir / ".aria2c-session"
         assert sample_config.session_file == expected
+
+    def test_validation_cache_file_property(self, sample_config):
+        """validation_cache_file lives in the download directory."""
+        expected = sample_config.download_dir / ".sync-cache.json"
+        assert sample_config.validation_cache_file == expected
+
+    def test_config_is_immutable(self, sample_config):
+        """Config is frozen and slotted; use dataclasses.replace to vary it."""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            sample_config.concurrent_downloads = 1
+        assert not hasattr(sample_config, "__dict__")
+
+        changed = dataclasses.replace(sample_config, concurrent_downloads=1)
+        assert changed.concurrent_downloads == 1
+        assert sample_config.concurrent_downloads == 5
+
+    def test_base_url_requires_trailing_slash(self, sample_config):
+        """A base_url that can't be concatenated with paths is rejected."""
+        with pytest.raises(ValueError, match="base_url"):
+            dataclasses.replace(sample_config, base_url="https://example.com/data")
@@ -1,16 +1,30 @@
 """Tests for downloader.py."""
 
+import dataclasses
+import gzip
+import json
+import os
+import subprocess
+import threading
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+import httpx
+
 from config import Config
 from downloader import (
+    scan_download_dir,
     get_files_to_download,
     load_session_urls,
     create_aria2c_input_file,
     run_aria2c,
+    read_aria2c_input_file,
+    create_completion_hook,
+    validate_completed_downloads,
     download_files,
     verify_parquet_integrity,
+    load_validation_cache,
+    save_validation_cache,
     DownloadResult,
 )
 
@@ -69,6 +83,138 @@ class TestGetFilesToDownload:
         assert progress_calls[0] == (1, 2)
         assert progress_calls[1] == (2, 2)
 
+    def test_progress_interval_batches_callbacks(self, tmp_path):
+        """Progress callback fires every progress_interval files and at the end."""
+        file_paths = [f"code/file{i}.parquet" for i in range(5)]
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+
+        progress_calls = []
+
+        get_files_to_download(
+            file_paths,
+            "https://example.com/",
+            download_dir,
+            on_progress=lambda completed, total: progress_calls.append(completed),
+            progress_interval=2,
+        )
+
+        assert progress_calls == [2, 4, 5]
+
+    def test_reuses_local_files_listing(self, tmp_path):
+        """A provided directory listing is used instead of rescanning."""
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+        (download_dir / "file1.parquet").write_text("content")
+
+        with patch("downloader.scan_download_dir", side_effect=AssertionError("rescanned")):
+            to_download, cache = get_files_to_download(
+                ["code/file1.parquet", "code/file2.parquet"],
+                "https://example.com/",
+                download_dir,
+                local_files={"file1.parquet": (download_dir / "file1.parquet").stat()},
+            )
+
+        assert to_download == [("https://example.com/code/file2.parquet", "file2.parquet")]
+        assert cache == {"file1.parquet": 7}
+
+    def test_no_per_file_stat_calls(self, tmp_path):
+        """Existence and sizes come from one scandir pass, not Path.stat per file."""
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+        (download_dir / "file1.parquet").write_text("content")
+        (download_dir / "empty.parquet").touch()
+
+        with patch.object(Path, "stat", side_effect=AssertionError("stat called")), \
+             patch.object(Path, "exists", side_effect=AssertionError("exists called")):
+            to_download, cache = get_files_to_download(
+                ["code/file1.parquet", "code/empty.parquet", "code/file2.parquet"],
+                "https://example.com/",
+                download_dir,
+            )
+
+        assert [filename for _, filename in to_download] == ["empty.parquet", "file2.parquet"]
+        assert cache == {"file1.parquet": 7}
+
+    def test_automatic_progress_interval(self, tmp_path):
+        """progress_interval=None scales the interval with the file count."""
+        file_paths = [f"code/file{i}.parquet" for i in range(1000)]
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+
+        progress_calls = []
+
+        get_files_to_download(
+            file_paths,
+            "https://example.com/",
+            download_dir,
+            on_progress=lambda completed, total: progress_calls.append(completed),
+            progress_interval=None,
+        )
+
+        assert len(progress_calls) == 200
+        assert progress_calls[-1] == 1000
+
+
+class TestScanDownloadDir:
+    """Tests for scan_download_dir()."""
+
+    @staticmethod
+    def _scandir_with_failing_entry(download_dir, name, error):
+        """Wrap os.scandir so the entry called name raises error on stat()."""
+        real_scandir = os.scandir
+
+        class FailingEntry:
+            def __init__(self, entry):
+                self.name = entry.name
+                self.is_file = entry.is_file
+
+            def stat(self):
+                raise error
+
+        class Scan:
+            def __enter__(self):
+                self.entries = real_scandir(download_dir)
+                return (
+                    FailingEntry(entry) if entry.name == name else entry
+                    for entry in self.entries
+                )
+
+            def __exit__(self, *exc_info):
+                self.entries.close()
+
+        return lambda path: Scan()
+
+    def test_vanished_entry_skipped(self, tmp_path):
+        """A file removed between readdir and stat only drops that file."""
+        (tmp_path / "kept.parquet").write_text("content")
+        (tmp_path / "gone.parquet").write_text("content")
+        scandir = self._scandir_with_failing_entry(
+            tmp_path, "gone.parquet", FileNotFoundError("gone")
+        )
+
+        with patch("downloader.os.scandir", scandir):
+            local_files = scan_download_dir(tmp_path)
+
+        assert list(local_files) == ["kept.parquet"]
+
+    def test_unreadable_entry_skipped(self, tmp_path):
+        """A permission error on one entry doesn't abort the scan."""
+        (tmp_path / "kept.parquet").write_text("content")
+        (tmp_path / "locked.parquet").write_text("content")
+        scandir = self._scandir_with_failing_entry(
+            tmp_path, "locked.parquet", PermissionError("denied")
+        )
+
+        with patch("downloader.os.scandir", scandir):
+            local_files = scan_download_dir(tmp_path)
+
+        assert list(local_files) == ["kept.parquet"]
+
+    def test_missing_directory_is_empty(self, tmp_path):
+        """A download directory that doesn't exist yet yields no files."""
+        assert scan_download_dir(tmp_path / "missing") == {}
+
 
 class TestLoadSessionUrls:
     """Tests for load_session_urls()."""
@@ -89,6 +235,13 @@ class TestLoadSessionUrls:
         assert "https://example.com/file1.parquet" in urls
         assert "https://example.com/file2.parquet" in urls
 
+    def test_empty_session_file(self, tmp_path):
+        """Returns empty set for an empty session file."""
+        session_file = tmp_path / ".aria2c-session"
+        session_file.write_text("")
+
+        assert load_session_urls(session_file) == set()
+
     def test_handle_missing_session_file(self, tmp_path):
         """Returns empty set when session file doesn't exist."""
         session_file = tmp_path / "nonexistent-session"
@@ -111,7 +264,8 @@ class TestCreateAria2cInputFile:
         input_file = create_aria2c_input_file(files)
 
         try:
-            content = input_file.read_text()
+            with gzip.open(input_file, "rt") as f:
+                content = f.read()
             assert "https://example.com/file1.parquet\n" in content
             assert "  out=file1.parquet\n" in content
             assert "https://example.com/file2.parquet\n" in content
@@ -119,12 +273,30 @@ class TestCreateAria2cInputFile:
         finally:
             input_file.unlink(missing_ok=True)
 
+    def test_accepts_generator(self):
+        """Streams entries from a generator without materializing a list."""
+        files = (
+            (f"https://example.com/file{i}.parquet", f"file{i}.parquet")
+            for i in range(3)
+        )
+
+        input_file = create_aria2c_input_file(files)
+
+        try:
+            with gzip.open(input_file, "rt") as f:
+                content = f.read()
+            assert content.count("  out=") == 3
+            assert "https://example.com/file2.parquet\n  out=file2.parquet\n" in content
+        finally:
+            input_file.unlink(missing_ok=True)
+
     def test_empty_list_creates_empty_file(self):
         """Creates empty file for empty list."""
         input_file = create_aria2c_input_file([])
 
         try:
-            content = input_file.read_text()
+            with gzip.open(input_file, "rt") as f:
+                content = f.read()
             assert content == ""
         finally:
             input_file.unlink(missing_ok=True)
@@ -157,11 +329,51 @@ class TestRunAria2c:
             cmd = mock_run.call_args[0][0]
             assert cmd[0] == "/usr/bin/aria2c"
             assert "-c" in cmd
+            assert "--remote-time=true" in cmd
+            # Empty files must be re-fetched, not revalidated into a 304
+            assert "--conditional-get=true" not in cmd
+            assert "--allow-overwrite=true" not in cmd
+            assert "--file-allocation=none" in cmd
+            assert "--max-connection-per-server=10" in cmd
             assert "-j10" in cmd
             assert f"-d{config.download_dir}" in cmd
             assert f"-i{input_file}" in cmd
             assert exit_code == 0
 
+    def test_resolves_aria2c_on_path(self, sample_config, tmp_path, monkeypatch):
+        """Bare aria2c names are resolved to an absolute path."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        fake_aria2c = bin_dir / "aria2c"
+        fake_aria2c.write_text("#!/bin/sh\n")
+        fake_aria2c.chmod(0o755)
+        monkeypatch.setenv("PATH", str(bin_dir))
+        input_file = tmp_path / "input.txt"
+        input_file.write_text("")
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+
+            run_aria2c(sample_config, input_file)
+
+            assert mock_run.call_args[0][0][0] == str(fake_aria2c)
+
+    def test_adds_completion_hook(self, sample_config, tmp_path):
+        """Passes an --on-download-complete hook and removes it afterwards."""
+        input_file = tmp_path / "input.txt"
+        input_file.write_text("")
+        completed_log = tmp_path / "completed.log"
+
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0)
+
+            run_aria2c(sample_config, input_file, completed_log=completed_log)
+
+            cmd = mock_run.call_args[0][0]
+            hooks = [arg for arg in cmd if arg.startswith("--on-download-complete=")]
+            assert len(hooks) == 1
+            assert not Path(hooks[0].split("=", 1)[1]).exists()
+
     def test_creates_download_directory(self, tmp_path):
         """Creates download directory if it doesn't exist."""
         config = Config(
@@ -185,6 +397,189 @@ class TestRunAria2c:
             assert config.download_dir.exists()
 
 
+class TestRunAria2cRpc:
+    """Tests for run_aria2c() against an aria2c JSON-RPC daemon."""
+
+    RPC_URL = "http://localhost:6800/jsonrpc"
+
+    @staticmethod
+    def _daemon(statuses, max_request_size=2 * 1024 * 1024):
+        """Fake aria2c daemon.
+
+        statuses maps each gid to the states it goes through, one per poll.
+        Requests over max_request_size are refused, like aria2c does.
+        """
+        calls = []
+        added = []
+
+        def listed(state):
+            # Our downloads currently in state; each then moves to its next state
+            gids = [gid for gid in added if statuses[gid][0]["status"] == state]
+            for gid in gids:
+                if len(statuses[gid]) > 1:
+                    statuses[gid].pop(0)
+            return [{"gid": gid} for gid in gids]
+
+        def respond(request):
+            if len(request.content) > max_request_size:
+                return httpx.Response(400)
+            body = json.loads(request.content)
+            assert body["method"] == "system.multicall"
+            results = []
+            for call in body["params"][0]:
+                calls.append(call)
+                method = call["methodName"]
+                if method == "aria2.addUri":
+                    added.append(f"gid{len(added)}")
+                    results.append([added[-1]])
+                elif method == "aria2.tellActive":
+                    results.append([listed("active")])
+                elif method == "aria2.tellWaiting":
+                    results.append([listed("waiting")])
+                else:
+                    results.append([statuses[call["params"][-2]][0]])
+            return httpx.Response(200, json={"id": body["id"], "result": results})
+
+        return respond, calls
+
+    def test_queues_files_and_waits_for_completion(self, sample_config, httpx_mock, monkeypatch):
+        """Adds all files in one multicall and reports finished files."""
+        monkeypatch.setattr("downloader.RPC_POLL_INTERVAL", 0)
+        config = dataclasses.replace(
+            sample_config, aria2c_rpc_url=self.RPC_URL, aria2c_rpc_secret="s3cret"
+        )
+        input_file = create_aria2c_input_file([
+            ("https://example.com/code/a.parquet", "a.parquet"),
+            ("https://example.com/code/b.parquet", "b.parquet"),
+        ])
+        completed_log = config.download_dir.parent / "completed.log"
+        respond, calls = self._daemon({
+            "gid0": [{"status": "complete"}],
+            "gid1": [{"status": "active"}, {"status": "complete"}],
+        })
+        httpx_mock.add_callback(respond, url=self.RPC_URL, is_reusable=True)
+
+        with patch("subprocess.run", side_effect=AssertionError("spawned aria2c")):
+            exit_code = run_aria2c(config, input_file, completed_log=completed_log)
+
+        assert exit_code == 0
+        add_calls = [c for c in calls if c["methodName"] == "aria2.addUri"]
+        assert [c["params"][1] for c in add_calls] == [
+            ["https://example.com/code/a.parquet"],
+            ["https://example.com/code/b.parquet"],
+        ]
+        assert all(c["params"][0] == "token:s3cret" for c in calls)
+        assert add_calls[0]["params"][2]["out"] == "a.parquet"
+        assert add_calls[0]["params"][2]["dir"] == str(config.download_dir)
+        assert "conditional-get" not in add_calls[0]["params"][2]
+        assert completed_log.read_text().splitlines() == [
+            str(config.download_dir / "a.parquet"),
+            str(config.download_dir / "b.parquet"),
+        ]
+        input_file.unlink()
+
+    def test_large_runs_split_into_bounded_requests(self, sample_config, httpx_mock, monkeypatch):
+        """Adds and status polls are chunked to stay under the request size limit."""
+        monkeypatch.setattr("downloader.RPC_POLL_INTERVAL", 0)
+        config = dataclasses.replace(sample_config, aria2c_rpc_url=self.RPC_URL)
+        input_file = create_aria2c_input_file(
+            (f"https://example.com/code/{i}.parquet", f"{i}.parquet") for i in range(5)
+        )
+        statuses = {f"gid{i}": [{"status": "complete"}] for i in range(5)}
+        respond, calls = self._daemon(statuses, max_request_size=1500)
+        httpx_mock.add_callback(respond, url=self.RPC_URL, is_reusable=True)
+
+        monkeypatch.setattr("downloader.RPC_BATCH_SIZE", 10)
+        assert run_aria2c(config, input_file) == 1  # One request for all 5 is refused
+
+        monkeypatch.setattr("downloader.RPC_BATCH_SIZE", 2)
+        assert run_aria2c(config, input_file) == 0
+        assert sum(c["methodName"] == "aria2.addUri" for c in calls) == 5
+        input_file.unlink()
+
+    def test_failed_download_returns_error_code(self, sample_config, httpx_mock, monkeypatch):
+        """A download ending in error yields aria2c's error code."""
+        monkeypatch.setattr("downloader.RPC_POLL_INTERVAL", 0)
+        config = dataclasses.replace(sample_config, aria2c_rpc_url=self.RPC_URL)
+        input_file = create_aria2c_input_file([
+            ("https://example.com/code/a.parquet", "a.parquet"),
+        ])
+        respond, _ = self._daemon({"gid0": [{"status": "error", "errorCode": "3"}]})
+        httpx_mock.add_callback(respond, url=self.RPC_URL, is_reusable=True)
+
+        assert run_aria2c(config, input_file) == 3
+        input_file.unlink()
+
+    def test_unreachable_daemon_returns_one(self, sample_config, httpx_mock):
+        """Connection errors are reported as a failed run, not raised."""
+        config = dataclasses.replace(sample_config, aria2c_rpc_url=self.RPC_URL)
+        input_file = create_aria2c_input_file([
+            ("https://example.com/code/a.parquet", "a.parquet"),
+        ])
+        httpx_mock.add_exception(httpx.ConnectError("refused"), url=self.RPC_URL)
+
+        assert run_aria2c(config, input_file) == 1
+        input_file.unlink()
+
+    def test_reads_back_input_file(self):
+        """read_aria2c_input_file() returns the entries that were written."""
+        entries = [
+            ("https://example.com/code/a.parquet", "a.parquet"),
+            ("https://example.com/code/b.parquet", "b.parquet"),
+        ]
+        input_file = create_aria2c_input_file(entries)
+
+        assert read_aria2c_input_file(input_file) == entries
+        input_file.unlink()
+
+
+class TestCompletionHook:
+    """Tests for create_completion_hook() / validate_completed_downloads()."""
+
+    def test_hook_appends_completed_path(self, tmp_path):
+        """Hook script appends aria2c's file path argument to the log."""
+        completed_log = tmp_path / "completed.log"
+        hook = create_completion_hook(completed_log)
+
+        try:
+            subprocess.run([str(hook), "gid1", "1", "/dl/file1.parquet"], check=True)
+            subprocess.run([str(hook), "gid2", "1", "/dl/file2.parquet"], check=True)
+        finally:
+            hook.unlink()
+
+        assert completed_log.read_text() == "/dl/file1.parquet\n/dl/file2.parquet\n"
+
+    def test_validates_completed_files(self, sample_config):
+        """Validates logged files, ignoring a trailing partial line."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        download_dir = sample_config.download_dir
+        download_dir.mkdir()
+        pq.write_table(pa.table({"col1": [1]}), download_dir / "valid.parquet")
+        (download_dir / "corrupt.parquet").write_bytes(b"not parquet")
+        (download_dir / "partial.parquet").write_bytes(b"not parquet")
+
+        completed_log = download_dir / "completed.log"
+        completed_log.write_text(
+            f"{download_dir / 'valid.parquet'}\n"
+            f"{download_dir / 'corrupt.parquet'}\n"
+            f"{download_dir / 'partial.parquet'}"
+        )
+        stop = threading.Event()
+        stop.set()
+        validated = {}
+        failed = []
+
+        validate_completed_downloads(
+            sample_config, completed_log, stop, validated, failed, poll_interval=0
+        )
+
+        assert failed == ["corrupt.parquet"]
+        assert "valid.parquet" in validated
+        assert (download_dir / "partial.parquet").exists()
+
+
 class TestDownloadFiles:
     """Tests for download_files()."""
 
@@ -213,6 +608,68 @@ class TestDownloadFiles:
         assert result.to_download == 0
         assert result.aria2c_exit_code == 0
 
+    def test_session_only_file_retried_after_integrity_failure(self, sample_config):
+        """Files only known from the session file are re-downloaded on retry."""
+        sample_config.download_dir.mkdir()
+        (sample_config.download_dir / "file1.parquet").write_text("content")
+        sample_config.session_file.write_text(
+            "https://example.com/old/session.parquet\n  out=session.parquet\n"
+        )
+        downloaded_inputs = []
+
+        def fake_run(config, input_file, completed_log=None):
+            with gzip.open(input_file, "rt") as f:
+                downloaded_inputs.append(f.read())
+            return 0
+
+        with patch("downloader.run_aria2c", side_effect=fake_run), \
+             patch("downloader.verify_parquet_integrity", return_value=["session.parquet"]):
+            result = download_files(
+                sample_config, ["code/file1.parquet"], max_integrity_retries=2
+            )
+
+        assert len(downloaded_inputs) == 2
+        assert "https://example.com/old/session.parquet" in downloaded_inputs[1]
+        assert result.integrity_retries == 2
+
+    def test_pre_integrity_failure_is_redownloaded(self, sample_config):
+        """Files deleted by the pre-download integrity check are downloaded."""
+        sample_config.download_dir.mkdir()
+        (sample_config.download_dir / "file1.parquet").write_bytes(b"corrupt")
+        downloaded_inputs = []
+
+        def fake_run(config, input_file, completed_log=None):
+            with gzip.open(input_file, "rt") as f:
+                downloaded_inputs.append(f.read())
+            return 0
+
+        with patch("downloader.run_aria2c", side_effect=fake_run):
+            result = download_files(
+                sample_config,
+                ["code/file1.parquet"],
+                integrity_check=False,
+                run_integrity=True,
+            )
+
+        assert result.to_download == 1
+        assert "https://example.com/code/file1.parquet" in downloaded_inputs[0]
+
+    def test_deep_run_keeps_validation_cache(self, sample_config):
+        """A deep integrity run doesn't overwrite the footer-check cache."""
+        config = dataclasses.replace(sample_config, deep_integrity=True)
+        config.download_dir.mkdir()
+        (config.download_dir / "file1.parquet").write_text("content")
+        save_validation_cache(
+            config.validation_cache_file, {"file1.parquet": (10, 20, 30)}
+        )
+
+        with patch("downloader.verify_parquet_integrity", return_value=[]):
+            download_files(config, ["code/file1.parquet"], run_integrity=True)
+
+        assert load_validation_cache(config.validation_cache_file) == {
+            "file1.parquet": (10, 20, 30)
+        }
+
 
 class TestVerifyParquetIntegrity:
     """Tests for verify_parquet_integrity()."""
@@ -235,6 +692,41 @@ class TestVerifyParquetIntegrity:
         # File should NOT be deleted
         assert parquet_file.exists()
 
+    def test_in_progress_files_not_sent_to_workers(self, tmp_path):
+        """Files with a control file are filtered from one listing, before any worker."""
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+        (download_dir / "partial.parquet").write_bytes(b"incomplete data")
+        (download_dir / "partial.parquet.aria2").write_text("control file")
+        (download_dir / "done.parquet").write_bytes(b"not parquet")
+
+        progress_calls = []
+        with patch("downloader._validate_parquet_batch", return_value=[]) as mock_batch:
+            verify_parquet_integrity(
+                download_dir,
+                ["partial.parquet", "done.parquet"],
+                on_progress=lambda completed, total: progress_calls.append(completed),
+            )
+
+        assert [call.args[1] for call in mock_batch.call_args_list] == [["done.parquet"]]
+        assert progress_calls == [1]
+
+    def test_progress_interval(self, tmp_path):
+        """on_progress fires every progress_interval files and at the end."""
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+        filenames = [f"file{i}.parquet" for i in range(5)]
+
+        progress_calls = []
+        verify_parquet_integrity(
+            download_dir,
+            filenames,
+            on_progress=lambda completed, total: progress_calls.append(completed),
+            progress_interval=2,
+        )
+
+        assert progress_calls == [2, 4, 5]
+
     def test_valid_parquet_passes(self, tmp_path):
         """Valid parquet file passes integrity check."""
         import pyarrow as pa
@@ -268,16 +760,47 @@ class TestVerifyParquetIntegrity:
         # File should be deleted
         assert not parquet_file.exists()
 
+    def test_deep_check_catches_corrupt_page(self, tmp_path):
+        """Deep mode fails a page checksum that the footer-only check misses."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+
+        parquet_file = download_dir / "bitrot.parquet"
+        pq.write_table(
+            pa.table({"col1": ["sourcify-payload"] * 8}),
+            parquet_file,
+            compression="NONE",
+            use_dictionary=False,
+            write_page_checksum=True,
+        )
+        data = bytearray(parquet_file.read_bytes())
+        # Length-prefixed value inside the data page (not the header statistics)
+        offset = data.index(b"\x10\x00\x00\x00sourcify-payload") + 4
+        data[offset] ^= 0xFF  # Footer stays intact
+        parquet_file.write_bytes(bytes(data))
+
+        assert verify_parquet_integrity(download_dir, ["bitrot.parquet"]) == []
+        assert parquet_file.exists()
+
+        failed = verify_parquet_integrity(download_dir, ["bitrot.parquet"], deep=True)
+
+        assert failed == ["bitrot.parquet"]
+        assert not parquet_file.exists()
+
     def test_permission_error_does_not_delete(self, tmp_path):
         """Permission errors don't delete the file but still report failure."""
+        import pyarrow as pa
         import pyarrow.parquet as pq
 
         download_dir = tmp_path / "downloads"
         download_dir.mkdir()
 
-        # Create a file that will trigger permission error
+        # Create a file that passes the footer pre-check, then make pyarrow fail
         parquet_file = download_dir / "protected.parquet"
-        parquet_file.write_bytes(b"some data")
+        pq.write_table(pa.table({"col1": [1]}), parquet_file)
 
         with patch.object(pq, "read_metadata", side_effect=PermissionError("Access denied")):
             failed = verify_parquet_integrity(download_dir, ["protected.parquet"])
@@ -287,6 +810,25 @@ class TestVerifyParquetIntegrity:
         # File should NOT be deleted (system error, not corruption)
         assert parquet_file.exists()
 
+    def test_truncated_parquet_rejected_without_pyarrow(self, tmp_path):
+        """Truncated files fail the footer pre-check before pyarrow is used."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+
+        parquet_file = download_dir / "truncated.parquet"
+        pq.write_table(pa.table({"col1": list(range(100))}), parquet_file)
+        data = parquet_file.read_bytes()
+        parquet_file.write_bytes(data[: len(data) // 2])
+
+        with patch.object(pq, "read_metadata", side_effect=AssertionError("not reached")):
+            failed = verify_parquet_integrity(download_dir, ["truncated.parquet"])
+
+        assert failed == ["truncated.parquet"]
+        assert not parquet_file.exists()
+
     def test_skip_missing_files(self, tmp_path):
         """Missing files are skipped (not reported as failed)."""
         download_dir = tmp_path / "downloads"
@@ -340,6 +882,64 @@ class TestVerifyParquetIntegrity:
         assert (1, 2) in progress_calls
         assert (2, 2) in progress_calls
 
+    def test_process_pool_validation(self, tmp_path):
+        """Process pool validation reports and deletes corrupt files."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+
+        pq.write_table(pa.table({"col1": [1]}), download_dir / "valid.parquet")
+        (download_dir / "corrupt.parquet").write_bytes(b"not parquet")
+
+        failed = verify_parquet_integrity(
+            download_dir,
+            ["valid.parquet", "corrupt.parquet"],
+            max_workers=2,
+            use_processes=True,
+        )
+
+        assert failed == ["corrupt.parquet"]
+        assert (download_dir / "valid.parquet").exists()
+        assert not (download_dir / "corrupt.parquet").exists()
+
+    def test_validated_cache_skips_unchanged_files(self, tmp_path):
+        """Files recorded in the validated cache are not re-read."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+        pq.write_table(pa.table({"col1": [1]}), download_dir / "file1.parquet")
+
+        validated = {}
+        assert verify_parquet_integrity(
+            download_dir, ["file1.parquet"], validated=validated
+        ) == []
+        assert "file1.parquet" in validated
+
+        with patch.object(pq, "read_metadata", side_effect=AssertionError("re-read")):
+            failed = verify_parquet_integrity(
+                download_dir, ["file1.parquet"], validated=validated
+            )
+
+        assert failed == []
+
+    def test_validated_cache_drops_corrupt_files(self, tmp_path):
+        """Changed files are re-validated and removed from the cache if corrupt."""
+        download_dir = tmp_path / "downloads"
+        download_dir.mkdir()
+        (download_dir / "file1.parquet").write_bytes(b"not parquet")
+
+        validated = {"file1.parquet": (1, 2, 3)}
+        failed = verify_parquet_integrity(
+            download_dir, ["file1.parquet"], validated=validated
+        )
+
+        assert failed == ["file1.parquet"]
+        assert validated == {}
+
     def test_delete_failure_logged_not_raised(self, tmp_path, caplog):
         """Delete failure is logged but doesn't raise exception."""
         download_dir = tmp_path / "downloads"
@@ -366,6 +966,27 @@ class TestVerifyParquetIntegrity:
         assert parquet_file.exists()
 
 
+class TestValidationCache:
+    """Tests for load_validation_cache() / save_validation_cache()."""
+
+    def test_round_trip(self, tmp_path):
+        """Saved cache loads back with tuple signatures."""
+        cache_file = tmp_path / ".sync-cache.json"
+
+        save_validation_cache(cache_file, {"file1.parquet": (10, 20, 30)})
+
+        assert load_validation_cache(cache_file) == {"file1.parquet": (10, 20, 30)}
+        assert not (tmp_path / ".sync-cache.json.tmp").exists()
+
+    def test_missing_or_invalid_cache_is_empty(self, tmp_path):
+        """Missing or malformed cache files load as empty."""
+        cache_file = tmp_path / ".sync-cache.json"
+        assert load_validation_cache(cache_file) == {}
+
+        cache_file.write_text("not json")
+        assert load_validation_cache(cache_file) == {}
+
+
 class TestGetFilesToDownloadEdgeCases:
     """Edge case tests for get_files_to_download()."""
 
@@ -408,3 +1029,14 @@ class TestGetFilesToDownloadEdgeCases:
         # Note: stat().st_size on a directory returns its metadata size, not 0
         # The exists() check passes, but it's not a proper file
         assert len(to_download) == 0 or "file.parquet" not in cache
+
+    def test_missing_download_dir(self, tmp_path):
+        """Missing download directory means every file needs download."""
+        to_download, cache = get_files_to_download(
+            ["code/file1.parquet"],
+            "https://example.com/",
+            tmp_path / "does-not-exist",
+        )
+
+        assert to_download == [("https://example.com/code/file1.parquet", "file1.parquet")]
+        assert cache == {}
@@ -2,9 +2,21 @@
 
 import logging
 from io import StringIO
+from logging.handlers import QueueHandler
 
 import pytest
-from logging_setup import setup_logging, get_logger, write_progress
+from logging_setup import (
+    CSI_ERASE_LINE_AFTER,
+    end_progress,
+    setup_logging,
+    get_logger,
+    write_progress,
+)
+
+
+def _queue_handler(logger):
+    """Return the QueueHandler that forwards records to the log file."""
+    return next(h for h in logger.handlers if isinstance(h, QueueHandler))
 
 
 class TestSetupLogging:
@@ -29,23 +41,47 @@ class TestSetupLogging:
         assert console_handler.level == logging.WARNING
 
     def test_file_handler_added(self, tmp_path):
-        """Log file option adds file handler."""
+        """Log file option adds a queue handler feeding a file handler."""
         log_file = tmp_path / "test.log"
         logger = setup_logging(log_file=log_file)
 
         assert len(logger.handlers) == 2
-        assert any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+        queue_handler = _queue_handler(logger)
+        assert any(
+            isinstance(h, logging.FileHandler) for h in queue_handler.listener.handlers
+        )
 
     def test_file_handler_is_debug_level(self, tmp_path):
         """File handler always captures DEBUG."""
         log_file = tmp_path / "test.log"
         logger = setup_logging(verbosity=-1, log_file=log_file)
 
+        queue_handler = _queue_handler(logger)
         file_handler = [
-            h for h in logger.handlers if isinstance(h, logging.FileHandler)
+            h for h in queue_handler.listener.handlers
+            if isinstance(h, logging.FileHandler)
         ][0]
+        assert queue_handler.level == logging.DEBUG
         assert file_handler.level == logging.DEBUG
 
+    def test_queued_records_written_to_file(self, tmp_path):
+        """Records reach the log file once the listener is flushed."""
+        log_file = tmp_path / "test.log"
+        logger = setup_logging(verbosity=-1, log_file=log_file)
+
+        logger.debug("queued %s", "message")
+        setup_logging()  # Reconfiguring stops and flushes the previous listener
+
+        assert "DEBUG [sourcify_sync] queued message" in log_file.read_text()
+
+    def test_logger_level_matches_most_verbose_handler(self, tmp_path):
+        """Logger drops records that no handler would emit."""
+        assert setup_logging(verbosity=-1).level == logging.WARNING
+        assert setup_logging(verbosity=0).level == logging.INFO
+
+        logger = setup_logging(verbosity=-1, log_file=tmp_path / "test.log")
+        assert logger.level == logging.DEBUG
+
 
 class TestGetLogger:
     """Tests for get_logger()."""
@@ -63,5 +99,39 @@ class TestWriteProgress:
         """write_progress outputs with carriage return prefix."""
         output = StringIO()
         monkeypatch.setattr("sys.stdout", output)
+        monkeypatch.setattr("logging_setup._PROGRESS_SUFFIX", "")
         write_progress("Test progress")
         assert output.getvalue() == "\rTest progress"
+
+    def test_erases_rest_of_line_on_terminal(self, monkeypatch):
+        """On a terminal, progress is followed by an erase-to-end-of-line."""
+        output = StringIO()
+        monkeypatch.setattr("sys.stdout", output)
+        monkeypatch.setattr("logging_setup._PROGRESS_SUFFIX", CSI_ERASE_LINE_AFTER)
+        write_progress("Test progress")
+        assert output.getvalue() == "\rTest progress\x1b[K"
+
+    def test_writes_to_file_descriptor(self, monkeypatch, tmp_path):
+        """Streams with a real descriptor receive the encoded update directly."""
+        out_path = tmp_path / "progress.txt"
+        with open(out_path, "w", encoding="utf-8") as output:
+            monkeypatch.setattr("sys.stdout", output)
+            monkeypatch.setattr("logging_setup._PROGRESS_SUFFIX", "")
+            write_progress("Verifying: [█░] 1/2")
+
+        assert out_path.read_bytes() == "\rVerifying: [█░] 1/2".encode("utf-8")
+
+
+class TestEndProgress:
+    """Tests for end_progress()."""
+
+    def test_newline_follows_bar_in_order(self, monkeypatch, tmp_path):
+        """The closing newline lands after the bar on the same descriptor."""
+        out_path = tmp_path / "progress.txt"
+        with open(out_path, "w", encoding="utf-8") as output:
+            monkeypatch.setattr("sys.stdout", output)
+            monkeypatch.setattr("logging_setup._PROGRESS_SUFFIX", "")
+            write_progress("Integrity: [█] 1/1")
+            end_progress()
+
+        assert out_path.read_bytes() == "\rIntegrity: [█] 1/1\n".encode("utf-8")
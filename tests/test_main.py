@@ -5,7 +5,10 @@ import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from main import parse_args, main
+import httpx
+import pytest
+
+from main import make_progress_callback, parse_args, main
 from downloader import DownloadResult
 
 
@@ -72,6 +75,49 @@ class TestParseArgs:
 
         assert args.log_file == Path("/tmp/test.log")
 
+    def test_explicit_argv(self):
+        """Parses an explicit argv list instead of sys.argv."""
+        with patch.object(sys, "argv", ["main.py", "-j", "3"]):
+            args = parse_args(["-j", "7", "--dry-run"])
+
+        assert args.concurrency == 7
+        assert args.dry_run is True
+
+    def test_parser_built_once(self):
+        """parse_args() reuses the module parser instead of rebuilding it."""
+        with patch("main.argparse.ArgumentParser", side_effect=AssertionError("rebuilt")):
+            first = parse_args(["-j", "2"])
+            second = parse_args(["-j", "4"])
+
+        assert (first.concurrency, second.concurrency) == (2, 4)
+
+
+class TestMakeProgressCallback:
+    """Tests for make_progress_callback()."""
+
+    def test_redraws_only_when_bar_changes(self):
+        """Redraws once per bar cell plus the final update."""
+        with patch("main.write_progress") as mock_write, \
+             patch("main.time.monotonic", return_value=0.0):
+            on_progress = make_progress_callback("Verifying", bar_width=40)
+            for completed in range(1, 1001):
+                on_progress(completed, 1000)
+
+        assert mock_write.call_count == 41
+        assert mock_write.call_args[0][0].endswith("] 1000/1000")
+
+    def test_redraws_after_min_interval(self):
+        """Redraws the counter when min_interval has elapsed."""
+        times = iter([0.0, 0.01, 1.0])
+        with patch("main.write_progress") as mock_write, \
+             patch("main.time.monotonic", side_effect=lambda: next(times)):
+            on_progress = make_progress_callback("Verifying", bar_width=40)
+            on_progress(1, 1000)
+            on_progress(2, 1000)
+            on_progress(3, 1000)
+
+        assert [c[0][0][-8:] for c in mock_write.call_args_list] == ["] 1/1000", "] 3/1000"]
+
 
 class TestMain:
     """Tests for main()."""
@@ -113,10 +159,26 @@ class TestMain:
                 download_dir=tmp_path / "downloads",
                 concurrent_downloads=5,
             )
-            mock_fetch.side_effect = Exception("Network error")
+            mock_fetch.side_effect = httpx.ConnectError("Network error")
 
             with caplog.at_level(logging.ERROR):
                 exit_code = main()
 
         assert exit_code == 1
         assert "Error fetching manifest" in caplog.text
+
+    def test_programming_errors_propagate(self, tmp_path):
+        """Unexpected exceptions from the fetch are not reported as fetch errors."""
+        with patch.object(sys, "argv", ["main.py"]), \
+             patch("main.Config.load") as mock_config, \
+             patch("main.fetch_manifest") as mock_fetch:
+
+            mock_config.return_value = MagicMock(
+                manifest_url="https://example.com/manifest.json",
+                download_dir=tmp_path / "downloads",
+                concurrent_downloads=5,
+            )
+            mock_fetch.side_effect = AttributeError("bug")
+
+            with pytest.raises(AttributeError):
+                main()
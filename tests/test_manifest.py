@@ -1,9 +1,35 @@
 """Tests for manifest.py."""
 
+import asyncio
+import json
+from unittest.mock import patch
+
 import httpx
 import pytest
 
-from manifest import fetch_manifest, extract_file_paths, validate_path
+from manifest import (
+    _BAD,
+    extract_file_paths,
+    extract_file_paths_set,
+    fetch_manifest,
+    fetch_manifests,
+    validate_path,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_manifest_memo():
+    """Start every test with an empty fetch_manifest memo."""
+    fetch_manifest.cache_clear()
+    yield
+    fetch_manifest.cache_clear()
+
+
+@pytest.fixture
+def client():
+    """A caller-owned httpx.Client, closed after the test."""
+    with httpx.Client(timeout=30.0) as client:
+        yield client
 
 
 class TestFetchManifest:
@@ -21,6 +47,47 @@ class TestFetchManifest:
 
         assert result == expected
 
+    def test_fetch_manifest_reuses_shared_client(self, httpx_mock, monkeypatch):
+        """Repeated fetches go through the module client, not one-shot httpx.get."""
+        monkeypatch.setattr(httpx, "get", lambda *a, **k: pytest.fail("httpx.get used"))
+        httpx_mock.add_response(
+            url="https://example.com/manifest.json",
+            json={"files": {}},
+            is_reusable=True,
+        )
+
+        assert fetch_manifest("https://example.com/manifest.json", max_age=0) == {"files": {}}
+        assert fetch_manifest("https://example.com/manifest.json", max_age=0) == {"files": {}}
+        assert len(httpx_mock.get_requests()) == 2
+
+    def test_fetch_manifest_uses_given_client(self, httpx_mock, client):
+        """A passed client serves every call and stays open for reuse."""
+        httpx_mock.add_response(
+            url="https://example.com/manifest.json",
+            json={"files": {}},
+        )
+        httpx_mock.add_response(
+            url="https://example.com/manifest.json",
+            status_code=404,
+        )
+
+        result = fetch_manifest("https://example.com/manifest.json", client=client, max_age=0)
+        assert result == {"files": {}}
+        with pytest.raises(httpx.HTTPStatusError):
+            fetch_manifest("https://example.com/manifest.json", client=client, max_age=0)
+
+        assert not client.is_closed
+
+    def test_fetch_manifest_invalid_json(self, httpx_mock):
+        """Raises ValueError when the body is not JSON."""
+        httpx_mock.add_response(
+            url="https://example.com/manifest.json",
+            content=b"not json",
+        )
+
+        with pytest.raises(ValueError):
+            fetch_manifest("https://example.com/manifest.json")
+
     def test_fetch_manifest_http_error_404(self, httpx_mock):
         """Raises exception on 404 error."""
         httpx_mock.add_response(
@@ -52,6 +119,155 @@ class TestFetchManifest:
             fetch_manifest("https://example.com/manifest.json")
 
 
+class TestFetchManifestMemo:
+    """Tests for the in-process fetch_manifest() memo."""
+
+    URL = "https://example.com/manifest.json"
+
+    def test_fetch_manifest_memoized(self, httpx_mock):
+        """Two calls within the TTL make a single request."""
+        httpx_mock.add_response(url=self.URL, json={"files": {"code": ["a.parquet"]}})
+
+        first = fetch_manifest(self.URL)
+        second = fetch_manifest(self.URL)
+
+        assert first is second
+        assert len(httpx_mock.get_requests()) == 1
+
+    def test_memoized_manifest_is_read_only(self, httpx_mock):
+        """The shared result can't be mutated by a caller."""
+        httpx_mock.add_response(url=self.URL, json={"files": {}})
+
+        manifest = fetch_manifest(self.URL)
+
+        with pytest.raises(TypeError):
+            manifest["files"] = {"x": ["y.parquet"]}
+
+    def test_expired_entry_refetched(self, httpx_mock, monkeypatch):
+        """Calls after max_age seconds go back to the server."""
+        clock = iter([0.0, 100.0])
+        monkeypatch.setattr("manifest.time.monotonic", lambda: next(clock))
+        httpx_mock.add_response(url=self.URL, json={"files": {}})
+        httpx_mock.add_response(url=self.URL, json={"files": {"code": ["a.parquet"]}})
+
+        fetch_manifest(self.URL, max_age=60.0)
+
+        assert fetch_manifest(self.URL, max_age=60.0) == {"files": {"code": ["a.parquet"]}}
+
+    def test_cache_clear(self, httpx_mock):
+        """cache_clear() forgets memoized manifests."""
+        httpx_mock.add_response(url=self.URL, json={"files": {}}, is_reusable=True)
+
+        fetch_manifest(self.URL)
+        fetch_manifest.cache_clear()
+        fetch_manifest(self.URL)
+
+        assert len(httpx_mock.get_requests()) == 2
+
+
+class TestFetchManifests:
+    """Tests for fetch_manifests()."""
+
+    def test_fetches_all_in_order(self, httpx_mock):
+        """Returns each manifest in the order of the given URLs."""
+        urls = [f"https://example.com/chain{i}/manifest.json" for i in range(3)]
+        for i, url in enumerate(urls):
+            httpx_mock.add_response(url=url, json={"files": {"code": [f"code/{i}.parquet"]}})
+
+        result = asyncio.run(fetch_manifests(urls))
+
+        assert result == [{"files": {"code": [f"code/{i}.parquet"]}} for i in range(3)]
+
+    def test_http_error_raises(self, httpx_mock):
+        """A failing URL raises instead of returning a partial list."""
+        httpx_mock.add_response(url="https://example.com/a.json", json={"files": {}})
+        httpx_mock.add_response(url="https://example.com/b.json", status_code=500)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(fetch_manifests(
+                ["https://example.com/a.json", "https://example.com/b.json"]
+            ))
+
+
+class TestFetchManifestCache:
+    """Tests for fetch_manifest() with a cache_dir."""
+
+    URL = "https://example.com/manifest.json"
+
+    def test_not_modified_reuses_cached_body(self, httpx_mock, tmp_path):
+        """A 304 answer to If-None-Match returns the stored manifest."""
+        expected = {"files": {"code": ["file1.parquet"]}}
+        httpx_mock.add_response(url=self.URL, json=expected, headers={"ETag": '"v1"'})
+        httpx_mock.add_response(
+            url=self.URL, status_code=304, match_headers={"If-None-Match": '"v1"'}
+        )
+
+        assert fetch_manifest(self.URL, cache_dir=tmp_path, max_age=0) == expected
+        assert fetch_manifest(self.URL, cache_dir=tmp_path, max_age=0) == expected
+
+    def test_changed_manifest_replaces_cache(self, httpx_mock, tmp_path):
+        """A 200 with a new ETag is returned and cached for the next request."""
+        httpx_mock.add_response(url=self.URL, json={"files": {}}, headers={"ETag": '"v1"'})
+        httpx_mock.add_response(
+            url=self.URL,
+            json={"files": {"code": ["new.parquet"]}},
+            headers={"ETag": '"v2"'},
+            match_headers={"If-None-Match": '"v1"'},
+        )
+        httpx_mock.add_response(
+            url=self.URL, status_code=304, match_headers={"If-None-Match": '"v2"'}
+        )
+
+        expected = {"files": {"code": ["new.parquet"]}}
+        fetch_manifest(self.URL, cache_dir=tmp_path, max_age=0)
+        assert fetch_manifest(self.URL, cache_dir=tmp_path, max_age=0) == expected
+        assert fetch_manifest(self.URL, cache_dir=tmp_path, max_age=0) == expected
+
+    def test_missing_cached_body_refetches(self, httpx_mock, tmp_path):
+        """A 304 without a usable stored body falls back to a full request."""
+        httpx_mock.add_response(url=self.URL, json={"files": {}}, headers={"ETag": '"v1"'})
+        httpx_mock.add_response(
+            url=self.URL, status_code=304, match_headers={"If-None-Match": '"v1"'}
+        )
+        httpx_mock.add_response(url=self.URL, json={"files": {"a": ["b.parquet"]}})
+
+        fetch_manifest(self.URL, cache_dir=tmp_path, max_age=0)
+        for body in tmp_path.glob(".manifest-body-*.json"):
+            body.unlink()
+
+        result = fetch_manifest(self.URL, cache_dir=tmp_path, max_age=0)
+        assert result == {"files": {"a": ["b.parquet"]}}
+
+    def test_last_modified_revalidation(self, httpx_mock, tmp_path):
+        """Without an ETag, If-Modified-Since revalidates and a 304 reads the cache."""
+        last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+        expected = {"files": {"code": ["file1.parquet"]}}
+        httpx_mock.add_response(
+            url=self.URL, json=expected, headers={"Last-Modified": last_modified}
+        )
+        httpx_mock.add_response(
+            url=self.URL,
+            status_code=304,
+            match_headers={"If-Modified-Since": last_modified},
+        )
+
+        fetch_manifest(self.URL, cache_dir=tmp_path, max_age=0)
+        with patch("manifest._json_loads", wraps=json.loads) as loads:
+            assert fetch_manifest(self.URL, cache_dir=tmp_path, max_age=0) == expected
+
+        # The 304 carried no body; the stored download was parsed instead
+        stored = next(tmp_path.glob(".manifest-body-*.json")).read_bytes()
+        loads.assert_called_once_with(stored)
+
+    def test_no_etag_skips_cache(self, httpx_mock, tmp_path):
+        """Responses without validators are not cached."""
+        httpx_mock.add_response(url=self.URL, json={"files": {}})
+
+        fetch_manifest(self.URL, cache_dir=tmp_path, max_age=0)
+
+        assert list(tmp_path.iterdir()) == []
+
+
 class TestExtractFilePaths:
     """Tests for extract_file_paths()."""
 
@@ -123,6 +339,56 @@ class TestExtractFilePaths:
 
         assert result == ["code/file1.parquet"]
 
+    def test_extract_file_paths_filters_unknown_top_directory(self, caplog):
+        """Nested paths outside the manifest's categories are filtered."""
+        manifest = {
+            "files": {
+                "code": ["code/file1.parquet", "secrets/file2.parquet", "bare.parquet"],
+                "metadata": ["metadata/file3.parquet"],
+            }
+        }
+
+        result = extract_file_paths(manifest)
+
+        assert result == ["code/file1.parquet", "bare.parquet", "metadata/file3.parquet"]
+        assert "secrets/file2.parquet" in caplog.text
+
+    def test_extract_file_paths_category_check_splits_on_backslash(self, caplog):
+        """Backslash-separated paths are checked against categories too."""
+        manifest = {"files": {"code": ["code\\file1.parquet", "secrets\\a.parquet"]}}
+
+        result = extract_file_paths(manifest)
+
+        assert result == ["code\\file1.parquet"]
+        assert "secrets\\a.parquet" in caplog.text
+
+
+class TestExtractFilePathsSet:
+    """Tests for extract_file_paths_set()."""
+
+    def test_matches_list_version(self, sample_manifest):
+        """Contains the same paths as extract_file_paths()."""
+        result = extract_file_paths_set(sample_manifest)
+
+        assert isinstance(result, frozenset)
+        assert result == set(extract_file_paths(sample_manifest))
+        assert "code/code_0_100000.parquet" in result
+
+    def test_filters_unsafe_paths(self):
+        """Applies the same traversal and absolute-path filtering."""
+        manifest = {
+            "files": {
+                "code": [
+                    "code/file1.parquet",
+                    "code/file1.parquet",
+                    "../../../etc/passwd",
+                    "/absolute/path.parquet",
+                ]
+            }
+        }
+
+        assert extract_file_paths_set(manifest) == frozenset({"code/file1.parquet"})
+
 
 class TestValidatePath:
     """Tests for validate_path()."""
@@ -151,3 +417,43 @@ class TestValidatePath:
         """Rejects absolute Windows paths."""
         assert validate_path("C:\\file.parquet") is False
         assert validate_path("D:\\path\\file.parquet") is False
+
+    def test_rejects_backslash_traversal_and_rooted_paths(self):
+        """Rejects traversal with Windows separators and rooted/UNC paths."""
+        assert validate_path("code\\..\\file.parquet") is False
+        assert validate_path("..\\file.parquet") is False
+        assert validate_path("\\\\server\\share\\file.parquet") is False
+        assert validate_path("C:file.parquet") is False
+        assert validate_path("c:/file.parquet") is False
+
+    def test_rejects_empty_path(self):
+        """Rejects an empty path."""
+        assert validate_path("") is False
+
+    def test_accepts_dots_inside_names(self):
+        """Double dots inside a name are not traversal."""
+        assert validate_path("code/file..parquet") is True
+        assert validate_path("code/..hidden/file.parquet") is True
+
+    @pytest.mark.parametrize("path", [
+        "file.parquet",
+        "code/file.parquet",
+        "a/b/c/file.parquet",
+        "code/file..parquet",
+        "code/..hidden/file.parquet",
+        "code/..",
+        "..",
+        "../file.parquet",
+        "code/../file.parquet",
+        "code\\..\\file.parquet",
+        "/etc/passwd",
+        "\\\\server\\share",
+        "C:\\file.parquet",
+        "C:file.parquet",
+        "c:/file.parquet",
+        "1:file.parquet",
+        "",
+    ])
+    def test_bulk_regex_matches_validate_path(self, path):
+        """The bulk-filter regex rejects exactly what validate_path rejects."""
+        assert (_BAD.search(path) is None) == validate_path(path)